@@ -2,33 +2,33 @@ import os
 
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
 
-import multiprocessing
-
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 
-import tensorflow as tf
-
-tf.compat.v1.logging.set_verbosity(tf.compat.v1.logging.ERROR)
-
-from deap import base, creator, tools, algorithms
+from deap import base, creator, tools
 
 from tensornas.core.individual import Individual
-from demos.DemoMNISTInput import *
+from tensornas.core.algorithms import ea_nsga2, sel_nsga2
+from tensornas.core.checkpoint import Checkpoint
+from tensornas.core.pareto import ParetoArchive
+from tensornas.core.cache import FitnessCache
+from tensornas.core.evaluator import EvaluationPool
+# Only the dataset's shape is imported, TensorFlow and the dataset are only loaded by the evaluation workers
+from demos.DemoMNISTInput import (
+    get_mnist_data,
+    input_tensor_shape,
+    mnist_class_count,
+    mnist_train_size,
+)
 
 from math import ceil
 
-### ENABLE GPU ###
-gpus = tf.config.experimental.list_physical_devices("GPU")
-tf.config.experimental.set_memory_growth(gpus[0], True)
-##################
-
 # Tensorflow parameters
 epochs = 1
-batch_size = 1
-training_size = len(images_train)
-step_size = int(ceil((1.0 * training_size) / batch_size)) / 100
+batch_size = 32
+training_size = mnist_train_size
+step_size = int(ceil(training_size / batch_size / 100))
 
 optimizer = "adam"
 loss = "sparse_categorical_crossentropy"
@@ -36,6 +36,11 @@ metrics = ["accuracy"]
 pop_size = 100
 gen_count = 20
 
+# Architectures that were already evaluated, eg. unchanged clones, are not retrained
+fitness_cache = FitnessCache("fitness_cache.db")
+# Each generation is checkpointed, rerunning the demo resumes an interrupted run
+checkpoint = Checkpoint("evolution_checkpoint.tnc")
+
 # Functions used for EA demo
 
 # Create a NAS model individual from one of the two demo models
@@ -55,20 +60,11 @@ def get_block_architecture():
 
 # Evaluation function for evaluating an individual. This simply calls the evaluate method of the TensorNASModel class
 fitnesses = []
-fitness_queue = multiprocessing.Queue()
-
-
-def fitness_recorder():
-    global fitnesses
-    while True:
-        fitnesses.append(fitness_queue.get(block=True))
-
-
-fitness_task = multiprocessing.Process(target=fitness_recorder)
 
 
 def evaluate_individual(individual):
-    ret = individual.evaluate(
+    images_train, labels_train, images_test, labels_test = get_mnist_data()
+    return individual.evaluate(
         train_data=images_train,
         train_labels=labels_train,
         test_data=images_test,
@@ -79,9 +75,8 @@ def evaluate_individual(individual):
         optimizer=optimizer,
         loss=loss,
         metrics=metrics,
+        cache=fitness_cache,
     )
-    fitness_queue.put(ret, block=True)
-    return ret
 
 
 # Note: please take note of arguments and return forms!
@@ -108,11 +103,6 @@ creator.create("Individual", Individual, fitness=creator.FitnessMulti)
 
 toolbox = base.Toolbox()
 
-### Multithreading ###
-pool = multiprocessing.Pool()
-toolbox.register("map", pool.map)
-######
-
 toolbox.register("get_block_architecture", get_block_architecture)
 toolbox.register(
     "individual",
@@ -122,6 +112,8 @@ toolbox.register(
     n=1,
 )
 toolbox.register("population", tools.initRepeat, list, toolbox.individual, n=pop_size)
+# Offspring are cloned copy-on-write instead of deep copied
+toolbox.register("clone", Individual.clone)
 
 # Genetic operators
 toolbox.register("evaluate", evaluate_individual)
@@ -129,7 +121,8 @@ from tensornas.core.crossover import crossover_individuals_sp
 
 toolbox.register("mate", crossover_individuals_sp)
 toolbox.register("mutate", mutate_individual)
-toolbox.register("select", tools.selTournament, tournsize=3)
+# Survivors are selected by Pareto front and crowding distance, see ea_nsga2
+toolbox.register("select", sel_nsga2)
 
 # Statistics
 history = tools.History()
@@ -137,26 +130,42 @@ toolbox.decorate("mate", history.decorator)
 toolbox.decorate("mutate", history.decorator)
 
 
-def compare_individual(ind1, ind2):
-
-    if ind1.fitness.values == ind2.fitness.values:
-        return True
+def main():
+    ### Multiprocessing ###
+    # Workers are spawned with their own TensorFlow instance and copy of MNIST, only genomes are sent to them
+    evaluation_pool = EvaluationPool(
+        get_mnist_data,
+        cache=fitness_cache,
+        epochs=epochs,
+        batch_size=batch_size,
+        steps=step_size,
+        optimizer=optimizer,
+        loss=loss,
+        metrics=metrics,
+    )
 
-    return False
+    def evaluate_population(individuals):
+        ret = evaluation_pool.evaluate_individuals(individuals)
+        fitnesses.extend(ret)
+        return ret
 
+    toolbox.register("evaluate_population", evaluate_population)
+    ######
 
-def main():
     pop = toolbox.population(n=pop_size)
     history.update(pop)
     # hof = tools.HallOfFame(1)
-    hof = tools.ParetoFront(compare_individual)
+    hof = ParetoArchive(max_size=1000)
     stats = tools.Statistics(lambda ind: ind.fitness.values)
     stats.register("avg", np.mean, axis=0)
     stats.register("std", np.std, axis=0)
     stats.register("min", np.min, axis=0)
     stats.register("max", np.max)
 
-    pop, logbook = algorithms.eaSimple(
+    # The fitnesses evaluated before the run was interrupted
+    fitnesses.extend(checkpoint.get_evaluated())
+
+    pop, logbook = ea_nsga2(
         pop,
         toolbox,
         cxpb=0.05,
@@ -165,7 +174,9 @@ def main():
         stats=stats,
         halloffame=hof,
         verbose=True,
+        checkpoint=checkpoint,
     )
+    evaluation_pool.close()
 
     return pop, logbook, hof
 
@@ -184,8 +195,8 @@ if __name__ == "__main__":
 
     x = [i.fitness.values[0] for i in hof.items]
     y = [i.fitness.values[1] for i in hof.items]
-    hof_fitness = [i.fitness for i in hof.items]
-    dominated = np.setdiff1d(fitnesses, hof_fitness)
+    front = set(hof.get_fitnesses())
+    dominated = [f for f in fitnesses if (float(f[0]), float(f[1])) not in front]
 
     import matplotlib.backends.backend_agg as agg
 
@@ -18,9 +18,9 @@ from demos.DemoMNISTInput import *
 
 # Tensorflow parameters
 epochs = 10
-batch_size = 1
+batch_size = 32
 training_size = len(images_train)
-step_size = int(ceil((1.0 * training_size) / batch_size)) / 100
+step_size = int(ceil(training_size / batch_size / 100))
 
 optimizer = "adam"
 loss = "sparse_categorical_crossentropy"
@@ -62,9 +62,7 @@ def evaluate_individual(individual):
 
 
 def mutate_individual(individual):
-    from copy import deepcopy
-
-    ind2 = deepcopy(individual)
+    ind2 = individual.clone()
     ind2.mutate(verbose=True)
     return (ind2,)
 
@@ -99,6 +97,8 @@ toolbox.register(
     n=1,
 )
 toolbox.register("population", tools.initRepeat, list, toolbox.individual, n=pop_size)
+# Offspring are cloned copy-on-write instead of deep copied
+toolbox.register("clone", Individual.clone)
 
 # Genetic operators
 toolbox.register("evaluate", evaluate_individual)
@@ -1,24 +1,65 @@
-from tensorflow import keras
-
-##### Training MNIST data
-from tensorflow import keras
-
 ##### Training MNIST data
-(
-    (images_train, labels_train),
-    (images_test, labels_test),
-) = keras.datasets.mnist.load_data()
-input_shape = images_train.shape
-images_train = images_train.reshape(
-    images_train.shape[0], images_train.shape[1], images_train.shape[2], 1
-)
-images_test = images_test.reshape(
-    images_test.shape[0], images_test.shape[1], images_test.shape[2], 1
-)
-input_tensor_shape = (images_train.shape[1], images_train.shape[2], 1)
-images_train = images_train.astype("float32")
-images_test = images_test.astype("float32")
-images_train /= 255
-images_test /= 255
+# The dataset's shape is known up front such that processes that only handle genomes, eg. the EA controller, do not
+# need to import TensorFlow or load the dataset
+input_tensor_shape = (28, 28, 1)
 mnist_class_count = 10
+mnist_train_size = 60000
+
+__all__ = [
+    "images_train",
+    "labels_train",
+    "images_test",
+    "labels_test",
+    "input_shape",
+    "input_tensor_shape",
+    "mnist_class_count",
+    "mnist_train_size",
+    "get_mnist_data",
+]
+
+_mnist_data = None
+
+
+def _load_mnist():
+    from tensorflow import keras
+
+    (
+        (images_train, labels_train),
+        (images_test, labels_test),
+    ) = keras.datasets.mnist.load_data()
+    images_train = images_train.reshape(
+        images_train.shape[0], images_train.shape[1], images_train.shape[2], 1
+    )
+    images_test = images_test.reshape(
+        images_test.shape[0], images_test.shape[1], images_test.shape[2], 1
+    )
+    images_train = images_train.astype("float32")
+    images_test = images_test.astype("float32")
+    images_train /= 255
+    images_test /= 255
+    return images_train, labels_train, images_test, labels_test
+
+
+def get_mnist_data():
+    """
+    Data loader used by evaluation workers, the data is loaded once, on the first call.
+
+    The normalised arrays are written once to a DatasetStore and memory-mapped from there, such that all evaluation
+    workers share a single copy of the data.
+    """
+    global _mnist_data
+    if _mnist_data is None:
+        from tensornas.core.dataset import DatasetStore
+
+        _mnist_data = DatasetStore("mnist_store").get(_load_mnist)
+    return _mnist_data
+
 
+def __getattr__(name):
+    # The dataset is loaded on the first access of one of its arrays
+    names = ["images_train", "labels_train", "images_test", "labels_test"]
+    if name in names:
+        return get_mnist_data()[names.index(name)]
+    if name == "input_shape":
+        return get_mnist_data()[0].shape[:3]
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
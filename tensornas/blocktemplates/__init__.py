@@ -1,61 +1,35 @@
-from setuptools import find_packages
-from pkgutil import iter_modules
 import os
 from enum import Enum
 
+from tensornas.core.util import find_module_names
 
-def find_block_architectures():
-    import tensornas.blocktemplates.blockarchitectures as BT
-
-    modules = []
-    BT_pkg = BT.__name__
-    BT_dir = os.path.dirname(BT.__file__)
-    # modules.append(find_modules(BT_pkg, BT_dir))
-    for mod in iter_modules([BT_dir]):
-        if not mod.ispkg:
-            mod_name = mod.name
-            modules.append(mod_name)
 
-    for pkg in find_packages(BT_dir):
-        pkg_path = BT_dir + "/" + pkg.replace(".", "/")
-        # modules.append(find_modules(BT_pkg + "." + pkg, pkg_path))
-        for mod in iter_modules([pkg_path]):
-            if not mod.ispkg:
-                mod_name = mod.name
-                modules.append(mod_name)
-
-    return modules
+def find_block_architectures():
+    """
+    Returns the names of the block architecture modules, the modules are not imported.
+    """
+    BT_dir = os.path.join(os.path.dirname(__file__), "blockarchitectures")
+    return [
+        mod_name.split(".")[-1]
+        for mod_name in find_module_names(__name__ + ".blockarchitectures", BT_dir)
+    ]
 
 
 def find_blocks():
-    import tensornas.blocktemplates.subblocks as BT
-
-    modules = []
-    BT_pkg = BT.__name__
-    BT_dir = os.path.dirname(BT.__file__)
-    # modules.append(find_modules(BT_pkg, BT_dir))
-    for mod in iter_modules([BT_dir]):
-        if not mod.ispkg:
-            mod_name = mod.name
-            modules.append(mod_name)
-
-    for pkg in find_packages(BT_dir):
-        pkg_path = BT_dir + "/" + pkg.replace(".", "/")
-        # modules.append(find_modules(BT_pkg + "." + pkg, pkg_path))
-        for mod in iter_modules([pkg_path]):
-            if not mod.ispkg:
-                mod_name = mod.name
-                modules.append(mod_name)
-
-    return modules
+    """
+    Returns the names of the sub-block modules, the modules are not imported.
+    """
+    BT_dir = os.path.join(os.path.dirname(__file__), "subblocks")
+    return [
+        mod_name.split(".")[-1]
+        for mod_name in find_module_names(__name__ + ".subblocks", BT_dir)
+    ]
 
 
 ArchitectureModules = find_block_architectures()
-ArchitectureModules = find_blocks()
+BlockModules = find_blocks()
 
-SupportedBlocks = Enum(
-    "SupportedBlocks", {str.upper(i): i for i in ArchitectureModules}
-)
+SupportedBlocks = Enum("SupportedBlocks", {str.upper(i): i for i in BlockModules})
 SupportedArchitectureBlocks = Enum(
     "SupportedArchitectureBlocks", {str.upper(i): i for i in ArchitectureModules}
 )
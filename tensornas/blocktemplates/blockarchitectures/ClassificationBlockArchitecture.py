@@ -17,6 +17,8 @@ class ClassificationArchitectureSubBlocks(Enum):
 
 
 class ClassificationBlockArchitecture(BlockArchitecture):
+    __slots__ = ("class_count",)
+
     MAX_SUB_BLOCKS = 1
     
     SUB_BLOCK_TYPES = ClassificationArchitectureSubBlocks
@@ -13,6 +13,8 @@ class EffNetArchitectureSubBlocks(Enum):
 
 
 class EffNetBlockArchitecture(BlockArchitecture):
+    __slots__ = ("class_count",)
+
     MAX_SUB_BLOCKS = 1
     SUB_BLOCK_TYPES = EffNetArchitectureSubBlocks
 
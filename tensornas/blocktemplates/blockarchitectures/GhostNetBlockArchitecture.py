@@ -15,6 +15,8 @@ class GhostNetArchitectureSubBlocks(Enum):
 
 
 class GhostNetBlockArchitecture(BlockArchitecture):
+    __slots__ = ("class_count",)
+
     MAX_SUB_BLOCKS = 3
     SUB_BLOCK_TYPES = GhostNetArchitectureSubBlocks
 
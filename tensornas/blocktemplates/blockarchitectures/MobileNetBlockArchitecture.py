@@ -13,6 +13,8 @@ class MobileNetArchitectureSubBlocks(Enum):
 
 
 class MobileNetBlockArchitecture(BlockArchitecture):
+    __slots__ = ("class_count",)
+
     MAX_SUB_BLOCKS = 3
     SUB_BLOCK_TYPES = MobileNetArchitectureSubBlocks
 
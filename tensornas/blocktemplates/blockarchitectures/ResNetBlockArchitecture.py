@@ -13,6 +13,8 @@ class ResNetArchitectureSubBlocks(Enum):
 
 
 class ResNetBlockArchitecture(BlockArchitecture):
+    __slots__ = ("class_count",)
+
     MAX_SUB_BLOCKS = 5
     SUB_BLOCK_TYPES = ResNetArchitectureSubBlocks
 
@@ -15,6 +15,8 @@ class ShuffleNetArchitectureSubBlocks(Enum):
 
 
 class ShuffleNetBlockArchitecture(BlockArchitecture):
+    __slots__ = ("class_count",)
+
     MAX_SUB_BLOCKS = 1
     SUB_BLOCK_TYPES = ShuffleNetArchitectureSubBlocks
 
@@ -14,6 +14,8 @@ class SqueezeNetArchitectureSubBlocks(Enum):
 
 
 class SqueezeNetBlockArchitecture(BlockArchitecture):
+    __slots__ = ("class_count",)
+
     MAX_SUB_BLOCKS = 3
     SUB_BLOCK_TYPES = SqueezeNetArchitectureSubBlocks
 
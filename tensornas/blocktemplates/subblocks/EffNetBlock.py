@@ -8,17 +8,13 @@ from tensornas.layers.Conv2D import Args as conv_args
 from tensornas.layers.MaxPool import Args as pool_args
 
 # TODO what happens with an EffNet block when the input channel is odd or 1?
-import tensorflow as tf
-### ENABLE GPU ###
-gpus = tf.config.experimental.list_physical_devices("GPU")
-tf.config.experimental.set_memory_growth(gpus[0], True)
-##################
 
 class SubBlockTypes(Enum):
     NONE = auto()
 
 
 class EffNetBlock(Block):
+    __slots__ = ()
 
     MAX_SUB_BLOCKS = 0
     SUB_BLOCK_TYPES = SubBlockTypes
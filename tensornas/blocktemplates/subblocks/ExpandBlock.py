@@ -1,5 +1,4 @@
 from enum import Enum, auto
-from tensorflow import keras
 
 from tensornas.core.block import Block
 from tensornas.core.layerblock import LayerBlock
@@ -16,6 +15,8 @@ class ExpandBlock(Block):
     collection of parallel convolutional layers.
     """
 
+    __slots__ = ()
+
     MAX_SUB_BLOCKS = 5
     MIN_SUB_BLOCK = 2
     SUB_BLOCK_TYPES = SubBlockTypes
@@ -35,7 +36,7 @@ class ExpandBlock(Block):
             ]
         return []
 
-    def get_keras_layers(self, input_tensor):
+    def get_keras_layers(self, input_tensor, keras_layers=None):
         """
         As an expand block creates a number of parallel 2D Conv layers the functional Tensorflow API must be used.
         The use of a concatenation operation allows for the layers to be parallelized, the one requirement of using
@@ -43,7 +44,12 @@ class ExpandBlock(Block):
         from which the input should be input in parallel. If this block is being called from a Fire Block this would
         mean that the squeeze layer must be passed in.
         """
-        layers = [sb.get_keras_layers(input_tensor) for sb in self.middle_blocks]
+        from tensorflow import keras
+
+        layers = [
+            sb.get_keras_layers(input_tensor, keras_layers=keras_layers)
+            for sb in self.middle_blocks
+        ]
         if len(layers) > 1:
             return keras.layers.Concatenate()(layers)
         else:
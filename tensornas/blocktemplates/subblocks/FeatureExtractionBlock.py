@@ -19,6 +19,8 @@ class FeatureExtractionBlock(Block):
     Layers that can be used in the extraction of features
     """
 
+    __slots__ = ()
+
     MAX_SUB_BLOCKS = 2
     SUB_BLOCK_TYPES = SubBlockTypes
 
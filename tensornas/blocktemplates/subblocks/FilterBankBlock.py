@@ -10,6 +10,7 @@ class SubBlockTypes(Enum):
 
 
 class FilterBankBlock(Block):
+    __slots__ = ()
 
     MAX_SUB_BLOCKS = 3
     SUB_BLOCK_TYPES = SubBlockTypes
@@ -55,8 +56,8 @@ class FilterBankBlock(Block):
             ]
         return []
 
-    def get_keras_layers(self, input_tensor):
+    def get_keras_layers(self, input_tensor, keras_layers=None):
         tmp = input_tensor
         for sb in self.input_blocks + self.middle_blocks + self.output_blocks:
-            tmp = sb.get_keras_layers(tmp)
+            tmp = sb.get_keras_layers(tmp, keras_layers=keras_layers)
         return tmp
@@ -1,5 +1,4 @@
 from enum import Enum, auto
-import tensorflow as tf
 
 from tensornas.core.block import Block
 from tensornas.core.layerblock import LayerBlock
@@ -20,6 +19,8 @@ class FireBlock(Block):
     Layers that can be used in the extraction of features
     """
 
+    __slots__ = ()
+
     MAX_SUB_BLOCKS = 2
     SUB_BLOCK_TYPES = SubBlockTypes
 
@@ -41,12 +42,16 @@ class FireBlock(Block):
         )
         return [pwconv_block, expand_block]
 
-    def get_keras_layers(self, input_tensor):
+    def get_keras_layers(self, input_tensor, keras_layers=None):
         """
         As the fire block generates parallel layers within its expand block the functional Tensorflow API must be used.
         The expand block must be fed the squeeze layer in such that the functional API can correctly construct the
         parallelized layers. Thus the get_keras_layers function must be overwritten to handle this passing.
         """
-        squeeze_layer = self.middle_blocks[0].get_keras_layers(input_tensor)
-        expand_layer = self.middle_blocks[1].get_keras_layers(squeeze_layer)
+        squeeze_layer = self.middle_blocks[0].get_keras_layers(
+            input_tensor, keras_layers=keras_layers
+        )
+        expand_layer = self.middle_blocks[1].get_keras_layers(
+            squeeze_layer, keras_layers=keras_layers
+        )
         return expand_layer
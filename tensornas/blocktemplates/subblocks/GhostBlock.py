@@ -15,6 +15,7 @@ class SubBlockTypes(Enum):
 
 
 class GhostBlock(Block):
+    __slots__ = ()
 
     MAX_SUB_BLOCKS = 2
     SUB_BLOCK_TYPES = SubBlockTypes
@@ -2,7 +2,6 @@
 # fixed layers and output fixed layers for the Expansion Block
 
 from enum import Enum, auto
-import tensorflow as tf
 
 from tensornas.core.block import Block
 from tensornas.blocktemplates.subblocks.FilterBankBlock import FilterBankBlock
@@ -26,6 +25,8 @@ class InceptionBlock(Block):
     Layers that can be used in the extraction of features
     """
 
+    __slots__ = ()
+
     MAX_SUB_BLOCKS = 4
     MIN_SUB_BLOCK = 2
     SUB_BLOCK_TYPES = SubBlockTypes
@@ -38,8 +39,13 @@ class InceptionBlock(Block):
                 )
             ]
 
-    def get_keras_layers(self, input_tensor):
-        filter_banks = [sb.get_keras_layers(input_tensor) for sb in self.middle_blocks]
+    def get_keras_layers(self, input_tensor, keras_layers=None):
+        import tensorflow as tf
+
+        filter_banks = [
+            sb.get_keras_layers(input_tensor, keras_layers=keras_layers)
+            for sb in self.middle_blocks
+        ]
         if len(filter_banks) > 1:
             return tf.keras.layers.Concatenate()(filter_banks)
         else:
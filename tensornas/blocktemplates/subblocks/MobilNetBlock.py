@@ -9,6 +9,8 @@ class SubBlockTypes(Enum):
 
 
 class MobileNetBlock(Block):
+    __slots__ = ()
+
     MAX_SUB_BLOCKS = 2
     SUB_BLOCK_TYPES = SubBlockTypes
 
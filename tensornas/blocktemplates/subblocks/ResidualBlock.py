@@ -1,7 +1,11 @@
 from enum import Enum, auto
-from tensorflow import keras
 
-from tensornas.core.modelutil import shortcut
+from tensornas.core.modelutil import (
+    shortcut,
+    shortcut_errors,
+    shortcut_param_count,
+    shortcut_flops,
+)
 from tensornas.core.block import Block
 from tensornas.blocktemplates.subblocks.FeatureExtractionBlock import (
     FeatureExtractionBlock,
@@ -13,6 +17,8 @@ class SubBlockTypes(Enum):
 
 
 def _shortcut(input, residual):
+    from tensorflow import keras
+
     input_shape = keras.backend.int_shape(input)
     residual_shape = keras.backend.int_shape(residual)
     stride_width = int(round(input_shape[1] / residual_shape[1]))
@@ -36,6 +42,8 @@ def _shortcut(input, residual):
 
 
 class ResidualBlock(Block):
+    __slots__ = ()
+
     MAX_SUB_BLOCKS = 1
     SUB_BLOCK_TYPES = SubBlockTypes
 
@@ -48,8 +56,23 @@ class ResidualBlock(Block):
             ]
         return []
 
-    def get_keras_layers(self, input_tensor):
+    def _validate_self(self):
+        return shortcut_errors(
+            tuple(self.get_input_shape()), tuple(self.get_output_shape())
+        )
+
+    def param_count(self):
+        return super().param_count() + shortcut_param_count(
+            self.get_input_shape(), self.get_output_shape()
+        )
+
+    def flops(self):
+        return super().flops() + shortcut_flops(
+            self.get_input_shape(), self.get_output_shape()
+        )
+
+    def get_keras_layers(self, input_tensor, keras_layers=None):
         tmp = input_tensor
         for sb in self.input_blocks + self.middle_blocks + self.output_blocks:
-            tmp = sb.get_keras_layers(tmp)
+            tmp = sb.get_keras_layers(tmp, keras_layers=keras_layers)
         return shortcut(input_tensor, tmp)
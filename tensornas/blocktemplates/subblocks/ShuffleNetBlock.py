@@ -5,7 +5,12 @@ from tensornas.blocktemplates.subblocks.TwoDClassificationBlock import (
 )
 
 from tensornas.core.layerargs import ArgActivations, ArgPadding
-from tensornas.core.modelutil import shortcut
+from tensornas.core.modelutil import (
+    shortcut,
+    shortcut_errors,
+    shortcut_param_count,
+    shortcut_flops,
+)
 from tensornas.core.block import Block
 from tensornas.core.layerblock import LayerBlock
 from tensornas.layers import SupportedLayers
@@ -27,6 +32,8 @@ class ShuffleNetBlock(Block):
     Layers that can be used in the extraction of features
     """
 
+    __slots__ = ()
+
     # TODO the input to the layer must be divisible by 4. Maybe some thought should be put
     # into making this more robust and removing the placeholder input conv2d block.
 
@@ -94,8 +101,31 @@ class ShuffleNetBlock(Block):
         )
         return layers
 
-    def get_keras_layers(self, input_tensor):
+    def _validate_self(self):
+        errors = shortcut_errors(
+            tuple(self.get_input_shape()), tuple(self.get_output_shape())
+        )
+        if self.output_blocks:
+            # The bottleneck reduces the residual's channels by a factor of 4
+            channels = self.output_blocks[0].get_input_shape()[-1]
+            if channels % 4:
+                errors.append(
+                    "residual channel depth {} is not divisible by 4".format(channels)
+                )
+        return errors
+
+    def param_count(self):
+        return super().param_count() + shortcut_param_count(
+            self.get_input_shape(), self.get_output_shape()
+        )
+
+    def flops(self):
+        return super().flops() + shortcut_flops(
+            self.get_input_shape(), self.get_output_shape()
+        )
+
+    def get_keras_layers(self, input_tensor, keras_layers=None):
         tmp = input_tensor
         for sb in self.input_blocks + self.middle_blocks + self.output_blocks:
-            tmp = sb.get_keras_layers(tmp)
+            tmp = sb.get_keras_layers(tmp, keras_layers=keras_layers)
         return shortcut(input_tensor, tmp)
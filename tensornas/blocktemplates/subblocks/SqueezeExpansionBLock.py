@@ -1,10 +1,3 @@
-from tensorflow.keras.layers import (
-    GlobalAveragePooling2D,
-    Reshape,
-    Dense,
-    Permute,
-    multiply,
-)
 from enum import Enum, auto
 
 from tensornas.core.block import Block
@@ -24,6 +17,7 @@ class SqueezeExpansionBlockLayerTypes(Enum):
 
 
 class SqueezeExpansionBlock(Block):
+    __slots__ = ("class_count",)
 
     MAX_SUB_BLOCKS = 2
     SUB_BLOCK_TYPES = SqueezeExpansionBlockLayerTypes
@@ -29,6 +29,8 @@ class TwoDClassificationBlock(Block):
     meaning it can be a random number
     """
 
+    __slots__ = ("class_count",)
+
     DROPOUT_RATE_MAX = 0.2
 
     MAX_SUB_BLOCKS = 2
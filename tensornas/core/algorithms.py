@@ -0,0 +1,369 @@
+"""
+Evolutionary algorithms that mirror those of deap.algorithms, extended to checkpoint each generation such that an
+interrupted run can be resumed, see Checkpoint, along with the multi-objective NSGA-II algorithm.
+"""
+import random
+
+import numpy as np
+
+
+def _evaluate_invalid(individuals, toolbox):
+    """
+    Evaluates the individuals with an invalid fitness, returning the evaluated individuals. If the toolbox has an
+    evaluate_population function registered, eg. EvaluationPool.evaluate_individuals, the individuals are evaluated
+    together by calling it with the list of individuals, otherwise the toolbox's evaluate function is mapped over them
+    using the toolbox's map function.
+
+    An evaluation may return None instead of a fitness, eg. for the candidates rejected by a SurrogateFilter, the
+    individual's fitness is then left invalid and it is not returned as evaluated.
+    """
+    invalid_ind = [ind for ind in individuals if not ind.fitness.valid]
+    evaluate_population = getattr(toolbox, "evaluate_population", None)
+    if evaluate_population is not None:
+        fitnesses = evaluate_population(invalid_ind)
+    else:
+        fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+    for ind, fit in zip(invalid_ind, fitnesses):
+        if fit is not None:
+            ind.fitness.values = fit
+    return [ind for ind in invalid_ind if ind.fitness.valid]
+
+
+def _record_generation(
+    gen, population, evaluated, logbook, stats, verbose, checkpoint, halloffame
+):
+    # Append the current generation statistics to the logbook
+    record = stats.compile(population) if stats else {}
+    logbook.record(gen=gen, nevals=len(evaluated), **record)
+    if verbose:
+        print(logbook.stream)
+
+    if checkpoint:
+        checkpoint.save(
+            gen,
+            population,
+            halloffame,
+            logbook,
+            [ind.fitness.values for ind in evaluated],
+        )
+
+
+def _start_run(population, toolbox, stats, halloffame, verbose, checkpoint):
+    """
+    Either resumes a run from the checkpoint, replacing the contents of population with the checkpointed population,
+    or evaluates the initial population.
+
+    @return Tuple of the last completed generation and the logbook
+    """
+    from deap import tools
+
+    record = checkpoint.load() if checkpoint else None
+    if record:
+        gen = record["generation"]
+        restored, logbook = checkpoint.restore(
+            record, type(population[0]), halloffame
+        )
+        population[:] = restored
+        if verbose:
+            print("[CHECKPOINT] resuming after generation {}".format(gen))
+        return gen, logbook
+
+    logbook = tools.Logbook()
+    logbook.header = ["gen", "nevals"] + (stats.fields if stats else [])
+
+    evaluated = _evaluate_invalid(population, toolbox)
+    # Individuals left unevaluated have no fitness to be selected by
+    population[:] = [ind for ind in population if ind.fitness.valid]
+    if halloffame is not None:
+        halloffame.update(population)
+    _record_generation(
+        0, population, evaluated, logbook, stats, verbose, checkpoint, halloffame
+    )
+    return 0, logbook
+
+
+def ea_simple(
+    population,
+    toolbox,
+    cxpb,
+    mutpb,
+    ngen,
+    stats=None,
+    halloffame=None,
+    verbose=__debug__,
+    checkpoint=None,
+):
+    """
+    DEAP's eaSimple, see deap.algorithms.eaSimple, which saves the state of the run to the checkpoint after every
+    generation. If the checkpoint already holds a generation the run is resumed from the last saved generation, the
+    given population is then only used to determine the class of the individuals and is replaced by the saved
+    population.
+
+    Individuals are evaluated using the toolbox's evaluate_population function if registered, eg.
+    EvaluationPool.evaluate_individuals, otherwise by mapping the toolbox's evaluate function over them.
+
+    @param checkpoint Optional Checkpoint
+    @return Tuple of the final population and the logbook
+    """
+    from deap.algorithms import varAnd
+
+    start_gen, logbook = _start_run(
+        population, toolbox, stats, halloffame, verbose, checkpoint
+    )
+
+    # Begin the generational process
+    for gen in range(start_gen + 1, ngen + 1):
+        # Select the next generation individuals
+        selected = toolbox.select(population, len(population))
+
+        # Vary the pool of individuals
+        offspring = varAnd(selected, toolbox, cxpb, mutpb)
+
+        evaluated = _evaluate_invalid(offspring, toolbox)
+        # Offspring left unevaluated are replaced by the individuals they were varied from
+        offspring = [
+            ind if ind.fitness.valid else parent
+            for ind, parent in zip(offspring, selected)
+        ]
+
+        # Update the hall of fame with the generated individuals
+        if halloffame is not None:
+            halloffame.update(offspring)
+
+        # Replace the current population by the offspring
+        population[:] = offspring
+
+        _record_generation(
+            gen, population, evaluated, logbook, stats, verbose, checkpoint, halloffame
+        )
+
+    return population, logbook
+
+
+def non_dominated_sort(wvalues):
+    """
+    Sorts the fitnesses of a population into non-dominated fronts. The dominance relations between all pairs of
+    fitnesses are computed at once as an n x n matrix, after which the fronts are peeled off one at a time.
+
+    @param wvalues n x m array of weighted fitness values, ie. DEAP's Fitness.wvalues, where larger is better
+    @return Array holding the index of each fitness' front, 0 being the non-dominated front
+    """
+    wvalues = np.asarray(wvalues, dtype=float)
+    better_equal = (wvalues[:, None, :] >= wvalues[None, :, :]).all(axis=2)
+    better = (wvalues[:, None, :] > wvalues[None, :, :]).any(axis=2)
+    # dominates[i, j] is True if fitness i dominates fitness j
+    dominates = better_equal & better
+
+    domination_count = dominates.sum(axis=0)
+    ranks = np.full(len(wvalues), -1)
+    front = np.flatnonzero(domination_count == 0)
+    rank = 0
+    while len(front):
+        ranks[front] = rank
+        domination_count = domination_count - dominates[front].sum(axis=0)
+        domination_count[ranks >= 0] = -1
+        front = np.flatnonzero(domination_count == 0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(wvalues):
+    """
+    The crowding distance of each fitness within a front, ie. the sum over the objectives of the normalized distance
+    between the fitness' neighbours. The extreme fitnesses of each objective have an infinite distance.
+
+    @param wvalues n x m array of the weighted fitness values of a front
+    @return Array of the crowding distances
+    """
+    wvalues = np.asarray(wvalues, dtype=float)
+    distances = np.zeros(len(wvalues))
+    if len(wvalues) <= 2:
+        distances[:] = np.inf
+        return distances
+
+    for objective in range(wvalues.shape[1]):
+        order = np.argsort(wvalues[:, objective], kind="stable")
+        values = wvalues[order, objective]
+        distances[order[0]] = distances[order[-1]] = np.inf
+        span = values[-1] - values[0]
+        # Objectives without a finite spread, eg. due to penalty fitnesses, do not separate the fitnesses
+        if span > 0 and np.isfinite(span):
+            distances[order[1:-1]] += (values[2:] - values[:-2]) / span
+    return distances
+
+
+def _get_ranks_and_distances(wvalues):
+    """
+    @return Tuple of the front index and the crowding distance within its front of each of the weighted fitnesses
+    """
+    wvalues = np.asarray(wvalues, dtype=float)
+    ranks = non_dominated_sort(wvalues)
+    distances = np.zeros(len(wvalues))
+    for rank in range(ranks.max() + 1 if len(ranks) else 0):
+        front = np.flatnonzero(ranks == rank)
+        distances[front] = crowding_distance(wvalues[front])
+    return ranks, distances
+
+
+def sel_nsga2(individuals, k):
+    """
+    NSGA-II environmental selection, the k individuals are taken front by front, the front that does not fit
+    entirely is truncated by keeping its least crowded individuals.
+    """
+    ranks, distances = _get_ranks_and_distances(
+        [ind.fitness.wvalues for ind in individuals]
+    )
+    # Sorted by rank followed by descending crowding distance
+    order = np.lexsort((-distances, ranks))
+    return [individuals[i] for i in order[:k]]
+
+
+def sel_tournament_nsga2(individuals, k):
+    """
+    NSGA-II mating selection, k binary tournaments in which the individual of the better front wins, ties are won by
+    the less crowded individual.
+    """
+    ranks, distances = _get_ranks_and_distances(
+        [ind.fitness.wvalues for ind in individuals]
+    )
+    chosen = []
+    for _ in range(k):
+        i, j = random.randrange(len(individuals)), random.randrange(len(individuals))
+        if (ranks[j], -distances[j]) < (ranks[i], -distances[i]):
+            i = j
+        chosen.append(individuals[i])
+    return chosen
+
+
+def ea_nsga2(
+    population,
+    toolbox,
+    cxpb,
+    mutpb,
+    ngen,
+    stats=None,
+    halloffame=None,
+    verbose=__debug__,
+    checkpoint=None,
+):
+    """
+    The NSGA-II multi-objective algorithm. Each generation, offspring are selected from the population using binary
+    tournaments on the individuals' fronts and crowding distances, see sel_tournament_nsga2, and varied using the
+    toolbox's mate and mutate operators, eg. crossover_individuals_sp and Individual.mutate, as in
+    deap.algorithms.varAnd. The next population is then selected from the population and its offspring using the
+    toolbox's select operator, which should be sel_nsga2.
+
+    As with ea_simple, individuals are evaluated using the toolbox's evaluate_population function if registered, the
+    state of the run is saved to the optional checkpoint after every generation and a run is resumed from the
+    checkpoint's last generation.
+
+    @return Tuple of the final population and the logbook
+    """
+    from deap.algorithms import varAnd
+
+    start_gen, logbook = _start_run(
+        population, toolbox, stats, halloffame, verbose, checkpoint
+    )
+
+    for gen in range(start_gen + 1, ngen + 1):
+        offspring = sel_tournament_nsga2(population, len(population))
+        offspring = varAnd(offspring, toolbox, cxpb, mutpb)
+
+        evaluated = _evaluate_invalid(offspring, toolbox)
+        # Offspring left unevaluated are discarded
+        offspring = [ind for ind in offspring if ind.fitness.valid]
+        if halloffame is not None:
+            halloffame.update(offspring)
+
+        population[:] = toolbox.select(population + offspring, len(population))
+
+        _record_generation(
+            gen, population, evaluated, logbook, stats, verbose, checkpoint, halloffame
+        )
+
+    return population, logbook
+
+
+def aging_evolution(
+    pool,
+    toolbox,
+    population_size,
+    sample_size,
+    evaluations,
+    stats=None,
+    halloffame=None,
+    verbose=__debug__,
+):
+    """
+    Asynchronous steady-state evolution with regularized aging, see Real et al. "Regularized Evolution for Image
+    Classifier Architecture Search". Instead of waiting for a whole generation to be evaluated, a new child is
+    submitted to the evaluation pool as soon as any worker finishes an evaluation, keeping all workers busy.
+
+    The population is a queue of at most population_size individuals, each evaluated child is added to the back of the
+    queue and the oldest individual is removed from its front, regardless of its fitness. Parents are chosen by
+    sampling sample_size individuals from the population and selecting one of them using the toolbox's select
+    operator, eg. sel_nsga2 to choose a non-dominated individual of the sample. A child is created by cloning and
+    mutating the parent using the toolbox's clone and mutate operators.
+
+    The first population_size children are new individuals created using the toolbox's individual function.
+
+    @param pool EvaluationPool used to evaluate the individuals, see EvaluationPool.submit
+    @param evaluations The number of individuals to be evaluated
+    @return Tuple of the final population, as a list ordered from oldest to youngest, and the logbook
+    """
+    import queue
+    from collections import deque
+
+    from deap import tools
+
+    logbook = tools.Logbook()
+    logbook.header = ["evals"] + (stats.fields if stats else [])
+
+    population = deque()
+    results = queue.Queue()
+
+    def submit(ind):
+        pool.submit(
+            ind.block_architecture, lambda fitness: results.put((ind, fitness))
+        )
+
+    def create_child():
+        # The population is filled by the first population_size submissions, not all of which may be evaluated yet
+        if submitted < population_size:
+            return toolbox.individual()
+        sample = random.sample(population, min(sample_size, len(population)))
+        (child,) = toolbox.mutate(toolbox.clone(toolbox.select(sample, 1)[0]))
+        del child.fitness.values
+        return child
+
+    submitted = 0
+    completed = 0
+    # Each worker is kept busy with one evaluation, a second keeps the worker's queue filled between results
+    in_flight = 2 * pool.workers
+    # Mutated children require an evaluated parent, as such only new individuals are submitted before the first result
+    while submitted < min(evaluations, in_flight, population_size):
+        submit(create_child())
+        submitted += 1
+
+    while completed < submitted:
+        ind, fitness = results.get()
+        completed += 1
+        ind.fitness.values = fitness
+
+        population.append(ind)
+        if len(population) > population_size:
+            population.popleft()
+        if halloffame is not None:
+            halloffame.update([ind])
+
+        while submitted < evaluations and submitted - completed < in_flight:
+            submit(create_child())
+            submitted += 1
+
+        if completed % population_size == 0 or completed == evaluations:
+            record = stats.compile(population) if stats else {}
+            logbook.record(evals=completed, **record)
+            if verbose:
+                print(logbook.stream)
+
+    return list(population), logbook
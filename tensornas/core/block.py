@@ -1,9 +1,14 @@
 import itertools
 import random
-import re
+import uuid
 from abc import ABC, abstractmethod
 
-from tensornas.core.util import mutate_enum_i
+from tensornas.core.util import (
+    canonical_value,
+    choose_mutation_operator,
+    get_mutation_operators,
+    mutate_enum_i,
+)
 
 
 class Block(ABC):
@@ -32,8 +37,27 @@ class Block(ABC):
         - Repair
         - Mutate
         - __init__
+
+    Blocks use __slots__ to reduce the memory of each node in the block architecture tree, sub-classes should also
+    define __slots__, listing any additional instance attributes, eg. `__slots__ = ("class_count",)`.
+
+    Block architectures are cloned copy-on-write, see clone, a sub-block can thus be shared by several block
+    architectures. A block owns a sub-block if the sub-block's parent_block is the block, shared sub-blocks have no
+    parent_block. Shared sub-blocks must not be modified, a block must first take ownership of a sub-block using
+    _own_sub_block, which copies the sub-block if it is shared.
     """
 
+    __slots__ = (
+        "block_id",
+        "input_shape",
+        "output_shape",
+        "parent_block",
+        "layer_type",
+        "input_blocks",
+        "middle_blocks",
+        "output_blocks",
+    )
+
     """
     A property to specify a minimum block count, is not required by each sub-class.
     """
@@ -55,6 +79,39 @@ class Block(ABC):
         """Constraining attribute of each Block sub-class that must be set"""
         return NotImplementedError
 
+    """
+    Optional relative selection weights of the block's mutation functions, keyed by the function names, functions
+    without a weight have a weight of 1.
+    """
+    MUTATION_WEIGHTS = {}
+
+    _mutation_operators = ()
+    _mutation_weights = None
+
+    def __init_subclass__(cls, **kwargs):
+        # The mutation operator table is built once per class instead of for every block instance
+        super().__init_subclass__(**kwargs)
+        cls._mutation_operators, cls._mutation_weights = get_mutation_operators(
+            cls, r"^_mutate(?!_self)"
+        )
+        cls._slot_names = tuple(
+            name
+            for klass in cls.__mro__
+            for name in getattr(klass, "__slots__", ())
+            if name not in ("__dict__", "__weakref__")
+        )
+
+    @property
+    def mutation_funcs(self):
+        return tuple(name for name, _ in self._mutation_operators)
+
+    def _validate_self(self):
+        """
+        An optional function that allows for the block to check constraints specific to the block, eg. constraints
+        on the shapes of its sub-blocks, during validation. Returns a list of descriptions of the violated constraints.
+        """
+        return []
+
     def _mutate_self(self, verbose=False):
         """
         An optional function that allows for the block to mutate itself during mutation
@@ -66,7 +123,9 @@ class Block(ABC):
             choice_index = random.choice(range(len(self.middle_blocks)))
             if verbose:
                 print("[MUTATE] middle block #{}".format(choice_index))
-            self.middle_blocks[choice_index].mutate(verbose=verbose)
+            self._own_sub_block(self.middle_blocks[choice_index]).mutate(
+                verbose=verbose
+            )
 
     def mutate(self, self_mutate_rate=0.0, verbose=False):
         """Similar to NetworkLayer objects, block mutation is a randomized call to any methods prexied with `_mutate`,
@@ -82,16 +141,23 @@ class Block(ABC):
         If one wishes to implement `_mutate_self` then it should return True to stop the subsequent
         re-invoking of mutate.
 
-        The probability of mutating the block itself instead of it's sub-block is pass in as self_mutate_rate."""
+        The probability of mutating the block itself instead of it's sub-block is pass in as self_mutate_rate. The
+        `_mutate` functions are selected uniformly unless weighted using the class's MUTATION_WEIGHTS.
+
+        After mutation the I/O shapes are propagated starting from the mutated block, when mutating a sub-block this is
+        done by the mutated sub-block itself."""
         if random.random() < self_mutate_rate:
             if self._mutate_self(verbose=verbose):
                 return
-        if self.mutation_funcs:
-            mutate_eval = "self." + random.choice(self.mutation_funcs)
+        if self._mutation_operators:
+            name, func = choose_mutation_operator(
+                self._mutation_operators, self._mutation_weights
+            )
             if verbose:
-                print("[MUTATE] invoking `{}`".format(mutate_eval))
-            eval(mutate_eval)(verbose=verbose)
-        self.reset_ba_input_shapes()
+                print("[MUTATE] invoking `self.{}`".format(name))
+            func(self, verbose=verbose)
+            if name != "_mutate_subblock":
+                self.propagate_io_shapes()
 
     def generate_constrained_output_sub_blocks(self, input_shape):
         """This method is called after the sub-blocks have been generated to generate the required blocks which are
@@ -155,16 +221,66 @@ class Block(ABC):
                 input_shape = self.get_input_shape()
             out_shape = input_shape
             for sb in sbs:
-                sb.set_input_shape(out_shape)
-                if sb.get_sb_count():
-                    out_shape = sb.refresh_io_shapes(sb.input_shape)
-                else:
-                    out_shape = sb.get_output_shape()
-                sb.set_output_shape(out_shape)
+                out_shape = self._refresh_sub_block_io_shapes(
+                    self._own_sub_block(sb), out_shape
+                )
             self.set_output_shape(self.get_output_shape())
             return out_shape
         return self.get_output_shape()
 
+    @staticmethod
+    def _refresh_sub_block_io_shapes(sb, input_shape):
+        sb.set_input_shape(input_shape)
+        if sb.get_sb_count():
+            out_shape = sb.refresh_io_shapes(sb.input_shape)
+        else:
+            out_shape = sb.get_output_shape()
+        sb.set_output_shape(out_shape)
+        return out_shape
+
+    def propagate_io_shapes(self, prev_output_shape=None):
+        """
+        Incrementally refreshes the I/O shapes of the block architecture after this block was changed, eg. mutated or
+        swapped in during crossover. Instead of refreshing the entire architecture, this block's input shape is
+        taken from the preceding block and its sub-blocks are refreshed, followed by the blocks after it. Propagation
+        stops as soon as a block's output shape is unchanged, as no following block can then be affected.
+
+        @param prev_output_shape The output shape of the block that previously held this block's position, eg. the
+        block that was swapped out during crossover, by default this block's own previous output shape
+        """
+        block = self
+        parent = block.parent_block
+        if not parent:
+            return self.refresh_io_shapes()
+
+        sbs = parent.input_blocks + parent.middle_blocks + parent.output_blocks
+        index = parent.get_block_index(block)
+        if index:
+            out_shape = sbs[index - 1].output_shape
+        else:
+            out_shape = parent.get_input_shape()
+
+        if prev_output_shape is None:
+            prev_output_shape = getattr(self, "output_shape", None)
+
+        while True:
+            for sb in sbs[index:]:
+                if sb is not self:
+                    sb = parent._own_sub_block(sb)
+                    prev_output_shape = getattr(sb, "output_shape", None)
+                out_shape = self._refresh_sub_block_io_shapes(sb, out_shape)
+                if out_shape == prev_output_shape:
+                    return out_shape
+
+            # The parent's output shape changed, propagation continues with the blocks following the parent
+            parent.set_output_shape(out_shape)
+            block = parent
+            parent = block.parent_block
+            if not parent:
+                return out_shape
+            sbs = parent.input_blocks + parent.middle_blocks + parent.output_blocks
+            index = parent.get_block_index(block) + 1
+
     def reset_ba_input_shapes(self):
         """
         The block architecture root is retrieved and the sub-block inputs and outputs are processed and repaired.
@@ -232,17 +348,20 @@ class Block(ABC):
         else:
             return None
 
-    def get_keras_layers(self, input_tensor):
+    def get_keras_layers(self, input_tensor, keras_layers=None):
         """By default this method simply calls this method in all child blocks, it should be overridden for layer
         blocks, ie. blocks that are leaves within the block hierarchy and contain a keras layer, such blocks should
         return an appropriately instantiated keras layer object
 
         TensorNAS uses the Tensorflow functional API so each keras layer requires an input tensor, this shuold be
         passed from the previous layer.
+
+        @param keras_layers Optional list to which each layer block appends a (LayerBlock, keras layer) tuple, it must
+        be passed on to all sub-blocks
         """
         tmp = input_tensor
         for sb in self.input_blocks + self.middle_blocks + self.output_blocks:
-            tmp = sb.get_keras_layers(tmp)
+            tmp = sb.get_keras_layers(tmp, keras_layers=keras_layers)
 
         return tmp
 
@@ -280,12 +399,12 @@ class Block(ABC):
         """
         Returns an ASCII tree representation of the block heirarchy starting from the current block.
         """
-        from tensornas.core.util import block_width, stack_str_blocks
-
         if not self.parent_block:
-            name = "ROOT"
-        else:
-            name = self._get_name()
+            return self._get_ascii_tree("ROOT")
+        return self._get_ascii_tree(self._get_name())
+
+    def _get_ascii_tree(self, name):
+        from tensornas.core.util import block_width, stack_str_blocks
 
         io_str = " {}->{}".format(self.get_input_shape(), self.get_output_shape())
         name = "{" + name + io_str + "}"
@@ -296,7 +415,7 @@ class Block(ABC):
         child_strs = (
             [" |"]
             + [
-                child.get_ascii_tree()
+                child._get_ascii_tree(child._get_name())
                 for child in self.input_blocks + self.middle_blocks + self.output_blocks
             ]
             + ["| "]
@@ -329,6 +448,74 @@ class Block(ABC):
 
         return name_str + "\n" + brace + "\n" + below
 
+    def param_count(self):
+        """
+        Returns the analytic parameter count of the block, by default the sum of the sub-blocks' parameter counts.
+        Blocks that create additional keras layers in get_keras_layers, eg. shortcut connections, should add the
+        parameters of such layers. No keras model is built, making this suitable for quickly rejecting oversized
+        architectures.
+        """
+        return sum(
+            sb.param_count()
+            for sb in self.input_blocks + self.middle_blocks + self.output_blocks
+        )
+
+    def flops(self):
+        """
+        Returns the analytic floating point operation count of a single inference of the block, see param_count.
+        """
+        return sum(
+            sb.flops()
+            for sb in self.input_blocks + self.middle_blocks + self.output_blocks
+        )
+
+    def get_validation_errors(self):
+        """
+        Statically checks the block hierarchy starting from the current block, using only the layers' args and I/O
+        shapes, such that invalid architectures can be rejected without building a keras model. Checks include
+        non-positive dimensions, layer specific checks, see NetworkLayer.get_validation_errors, and block specific
+        checks, see _validate_self.
+
+        @return List of descriptions of the violated constraints, empty if the block is valid
+        """
+        errors = []
+        try:
+            errors.extend(
+                "{}: {}".format(type(self).__name__, error)
+                for error in self._validate_self()
+            )
+        except Exception as e:
+            errors.append("{}: {}".format(type(self).__name__, e))
+        for sb in self.input_blocks + self.middle_blocks + self.output_blocks:
+            errors.extend(sb.get_validation_errors())
+        return errors
+
+    def validate(self, verbose=False):
+        """
+        @return True if get_validation_errors finds no violated constraints
+        """
+        errors = self.get_validation_errors()
+        if verbose:
+            for error in errors:
+                print("[VALIDATE] {}".format(error))
+        return not errors
+
+    def get_structure(self):
+        """
+        Returns a hashable, canonical description of the block hierarchy starting from the current block. The
+        description contains the block types, layer arguments and I/O shapes but no object identities, meaning that
+        two structurally identical architectures, eg. an architecture and its unchanged clone, are described equally.
+        """
+        return (
+            type(self).__name__,
+            canonical_value(self.layer_type),
+            canonical_value(self.get_input_shape()),
+            tuple(
+                sb.get_structure()
+                for sb in self.input_blocks + self.middle_blocks + self.output_blocks
+            ),
+        )
+
     def get_index_in_parent(self):
         if self.parent_block:
             return self.parent_block.get_block_index(self)
@@ -379,6 +566,60 @@ class Block(ABC):
             if index < len(self.output_blocks):
                 self.output_blocks[index] = block
 
+    def _copy_node(self):
+        """
+        Returns a copy of the block that shares the block's sub-blocks. The sub-blocks are detached from the block,
+        ie. become shared, such that neither the block nor its copy modifies them without first copying them.
+        """
+        block = object.__new__(type(self))
+        for name in self._slot_names:
+            if hasattr(self, name):
+                setattr(block, name, getattr(self, name))
+        if hasattr(self, "__dict__"):
+            block.__dict__.update(self.__dict__)
+        block.input_blocks = list(self.input_blocks)
+        block.middle_blocks = list(self.middle_blocks)
+        block.output_blocks = list(self.output_blocks)
+        for sb in self.input_blocks + self.middle_blocks + self.output_blocks:
+            sb.parent_block = None
+        return block
+
+    def _own_sub_block(self, sb):
+        """
+        Takes ownership of a sub-block before it is modified, a shared sub-block is replaced by a copy owned by this
+        block.
+
+        @return The owned sub-block
+        """
+        if sb.parent_block is self:
+            return sb
+        block = sb._copy_node()
+        block.parent_block = self
+        for blocks in (self.input_blocks, self.middle_blocks, self.output_blocks):
+            for index, b in enumerate(blocks):
+                if b is sb:
+                    blocks[index] = block
+                    return block
+        raise Exception("Block is not a sub-block of {}".format(self._get_name()))
+
+    def _own_all_sub_blocks(self):
+        """
+        Takes ownership of the entire block hierarchy, such that the parent_block of every sub-block is valid, eg.
+        before walking the hierarchy upwards from its leaves.
+        """
+        for sb in self.input_blocks + self.middle_blocks + self.output_blocks:
+            self._own_sub_block(sb)._own_all_sub_blocks()
+
+    def clone(self):
+        """
+        Returns a copy-on-write clone of the block hierarchy. The clone shares all sub-blocks with this block, only
+        the sub-blocks along the path to a modified block, eg. a mutated layer, are copied when they are modified, by
+        either the clone or this block. The block_id of each block is kept.
+        """
+        block = self._copy_node()
+        block.parent_block = None
+        return block
+
     def get_sb_count(self):
         return len(self.input_blocks + self.middle_blocks + self.output_blocks)
 
@@ -393,15 +634,14 @@ class Block(ABC):
         sequence is performed.
 
         The layer type is used by the parent block to identify the block's type from it's enum of valid sub-block types.
+
+        Each block is given a unique block_id, the ID is kept when a block architecture is copied, eg. during mutation
+        or crossover, and thus identifies blocks that are inherited from a parent architecture.
         """
+        self.block_id = uuid.uuid4().hex
         self.input_shape = input_shape
         self.parent_block = parent_block
         self.layer_type = layer_type
-        self.mutation_funcs = [
-            func
-            for func in dir(self)
-            if callable(getattr(self, func)) and re.search(r"^_mutate(?!_self)", func)
-        ]
 
         self.input_blocks = []
         self.middle_blocks = []
@@ -420,3 +660,5 @@ class Block(ABC):
         if ob:
             self.output_blocks.extend(ob)
 
+        self.output_shape = self.get_output_shape()
+
@@ -1,5 +1,7 @@
+import uuid
+from itertools import zip_longest
+
 import numpy as np
-import tensorflow as tf
 
 from tensornas.core.block import Block
 
@@ -10,13 +12,84 @@ class BlockArchitecture(Block):
     number of probability outputs that are used in the classification of some input.
     The abstract block architecture class defines the methods that must be implemented to allow for a type of block
     architecture to be created, namely what sort of sub-blocks the block architecture can generate.
+
+    Each architecture has a lineage, the IDs of the architecture and of its most recent ancestors, which identifies
+    the trained weights the architecture can inherit from, see WeightStore. Unlike block IDs, an architecture's ID is
+    not shared with its clones.
+    """
+
+    __slots__ = ("lineage",)
+
     """
+    The number of IDs kept in a lineage, ie. the architecture's ID followed by the IDs of its closest ancestors.
+    """
+    MAX_LINEAGE_LENGTH = 8
+
+    def __init__(self, input_shape, parent_block, layer_type):
+        # The ID is assigned before the architecture is first encoded, such that evaluation workers store the trained
+        # weights under the same ID as the architecture's children inherit from
+        self.lineage = (uuid.uuid4().hex,)
+        super().__init__(input_shape, parent_block=parent_block, layer_type=layer_type)
+
+    def get_lineage(self):
+        """
+        @return Tuple of the IDs of the architecture and its ancestors, most recent first, architectures decoded from
+        genomes that hold no lineage are given a new ID
+        """
+        if not hasattr(self, "lineage"):
+            self.lineage = (uuid.uuid4().hex,)
+        return self.lineage
+
+    def clone(self):
+        """
+        Returns a copy-on-write clone of the architecture, see Block.clone. The clone is given a new ID, its lineage
+        continues with this architecture's lineage.
+        """
+        block = super().clone()
+        block.lineage = (uuid.uuid4().hex,) + self.get_lineage()[
+            : self.MAX_LINEAGE_LENGTH - 1
+        ]
+        return block
 
-    def get_keras_model(self, optimizer, loss, metrics):
+    def merge_lineage(self, lineage):
+        """
+        Adds the ancestors of another architecture to this architecture's lineage, eg. after blocks were swapped in
+        from the other architecture during crossover. The ancestors of both architectures are interleaved such that
+        the closest ancestors are kept.
+
+        @param lineage The other architecture's lineage, see get_lineage
+        """
+        ancestors = []
+        for pair in zip_longest(self.get_lineage()[1:], lineage[1:]):
+            ancestors.extend(i for i in pair if i is not None and i not in ancestors)
+        self.lineage = (self.get_lineage()[0],) + tuple(
+            ancestors[: self.MAX_LINEAGE_LENGTH - 1]
+        )
+
+    def _get_keras_model_and_layers(self, optimizer, loss, metrics):
+        """
+        @return Tuple of the compiled keras model and a list of (LayerBlock, keras layer) tuples, one for each of the
+        architecture's layer blocks
+        """
+        import tensorflow as tf
+
+        # The list is passed down the hierarchy as shared sub-blocks have no parent_block to find it through
+        keras_layers = []
         inp = tf.keras.Input(shape=self.input_shape)
-        out = self.get_keras_layers(inp)
+        out = self.get_keras_layers(inp, keras_layers=keras_layers)
         model = tf.keras.Model(inp, out)
         model.compile(optimizer=optimizer, loss=loss, metrics=metrics)
+        return model, keras_layers
+
+    def get_keras_model(self, optimizer, loss, metrics, weight_store=None):
+        """
+        @param weight_store Optional WeightStore from which the layers inherit previously trained weights
+        """
+        model, keras_layers = self._get_keras_model_and_layers(
+            optimizer=optimizer, loss=loss, metrics=metrics
+        )
+        if weight_store is not None:
+            weight_store.inherit(keras_layers, self.get_lineage())
         return model
 
     def evaluate(
@@ -32,18 +105,161 @@ class BlockArchitecture(Block):
         loss,
         metrics,
         filename=None,
+        cache=None,
+        max_params=None,
+        weight_store=None,
+        dataset=None,
+    ):
+        """
+        Builds, trains and tests the keras model of the architecture.
+
+        Architectures that fail validation, see Block.validate, are rejected without building a model.
+
+        @param cache Optional FitnessCache, if the architecture was already evaluated using the same training
+        configuration the cached fitness is returned without building or training a model
+        @param max_params Optional parameter budget, architectures whose analytic parameter count exceeds the budget
+        are rejected without building a model
+        @param weight_store Optional WeightStore, layers unchanged from a previously trained parent architecture are
+        warm-started with the parent's weights and the trained weights are stored for future children
+        @param dataset Optional Dataset built from the same data, the model is then trained and tested using the
+        dataset's tf.data pipelines instead of the arrays, train_data then only determines the number of training
+        samples used
+
+        @return Tuple of the model's parameter count and accuracy
+        """
+        if not self.validate():
+            return [np.inf, 0]
+
+        if max_params is not None and self.param_count() > max_params:
+            return [np.inf, 0]
+
+        if cache is not None:
+            key = cache.get_key(
+                self,
+                train_size=len(train_data),
+                epochs=epochs,
+                steps=steps,
+                batch_size=batch_size,
+                optimizer=optimizer,
+                loss=loss,
+                metrics=metrics,
+            )
+            fitness = cache.get(key)
+            if fitness is not None:
+                return fitness
+
+        fitness = self._evaluate(
+            train_data=train_data,
+            train_labels=train_labels,
+            test_data=test_data,
+            test_labels=test_labels,
+            epochs=epochs,
+            steps=steps,
+            batch_size=batch_size,
+            optimizer=optimizer,
+            loss=loss,
+            metrics=metrics,
+            filename=filename,
+            weight_store=weight_store,
+            dataset=dataset,
+        )
+
+        # Failed trainings, eg. due to running out of memory, are not cached as they need not fail again
+        if fitness is None:
+            return [np.inf, 0]
+
+        if cache is not None:
+            cache.put(key, fitness)
+
+        return fitness
+
+    def evaluate_zero_cost(
+        self,
+        data,
+        labels,
+        loss,
+        proxy="jacob_cov",
+        batch_size=32,
+        optimizer="sgd",
+        metrics=None,
     ):
+        """
+        Scores the architecture using a zero-cost proxy, see tensornas.core.zerocost, computed on a single
+        mini-batch. The keras model is built but never trained, allowing for many architectures to be pre-screened
+        cheaply before training only the most promising ones.
+
+        @param proxy Name of the proxy to use, one of synflow, jacob_cov or grad_norm
+        @param batch_size The number of samples the proxy is computed on, jacob_cov requires at least 2
+
+        @return Tuple of the model's parameter count and proxy score, higher scores are better
+        """
+        if proxy == "jacob_cov" and min(batch_size, len(data)) < 2:
+            raise ValueError("jacob_cov requires a batch of at least 2 samples")
+
+        if not self.validate():
+            return [np.inf, -np.inf]
+
+        from tensornas.core.zerocost import PROXIES
+
         try:
             model = self.get_keras_model(
+                optimizer=optimizer, loss=loss, metrics=metrics or []
+            )
+            score = PROXIES[proxy](
+                model, data[:batch_size], labels[:batch_size], loss
+            )
+        except Exception as e:
+            print("Error scoring model, {}".format(e))
+            return [np.inf, -np.inf]
+        params = model.count_params()
+        if params == 0:
+            params = np.inf
+
+        return params, score
+
+    def _evaluate(
+        self,
+        train_data,
+        train_labels,
+        test_data,
+        test_labels,
+        epochs,
+        steps,
+        batch_size,
+        optimizer,
+        loss,
+        metrics,
+        filename=None,
+        weight_store=None,
+        dataset=None,
+    ):
+        """
+        @return Tuple of the model's parameter count and accuracy or None if the model could not be built or trained
+        """
+        import tensorflow as tf
+
+        try:
+            model, keras_layers = self._get_keras_model_and_layers(
                 optimizer=optimizer, loss=loss, metrics=metrics
             )
+            if weight_store is not None:
+                weight_store.inherit(keras_layers, self.get_lineage())
             model.summary()
             if filename:
                 from tensornas.core.util import save_model
 
                 save_model(model, filename)
 
-            if batch_size == -1:
+            if dataset is not None:
+                # A batch size of -1 uses keras' default batch size
+                batch_size = 32 if batch_size == -1 else batch_size
+                model.fit(
+                    dataset.get_train(batch_size, train_size=len(train_data)),
+                    epochs=epochs,
+                    steps_per_epoch=steps or -(-len(train_data) // batch_size),
+                    verbose=1,
+                )
+            elif batch_size == -1:
                 model.fit(
                     x=train_data,
                     y=train_labels,
@@ -64,7 +280,9 @@ class BlockArchitecture(Block):
             import math
 
             print("Error fitting model, {}".format(e))
-            return [np.inf, 0]
+            return None
+        if weight_store is not None:
+            weight_store.store(keras_layers, self.get_lineage())
         params = int(
             np.sum([tf.keras.backend.count_params(p) for p in model.trainable_weights])
         ) + int(
@@ -74,6 +292,9 @@ class BlockArchitecture(Block):
         )
         if params == 0:
             params = np.inf
-        accuracy = model.evaluate(test_data, test_labels)[1] * 100
+        if dataset is not None:
+            accuracy = model.evaluate(dataset.get_test())[1] * 100
+        else:
+            accuracy = model.evaluate(test_data, test_labels)[1] * 100
 
         return params, accuracy
@@ -0,0 +1,104 @@
+import hashlib
+import sqlite3
+
+from tensornas.core.util import canonical_value
+
+
+def get_genome_hash(block):
+    """
+    Returns a hash of the canonical encoding of a block hierarchy, see tensornas.core.genome.encode. Structurally
+    identical block architectures, eg. an unchanged clone or a child produced by a no-op mutation, share the same hash.
+    """
+    from tensornas.core.genome import encode
+
+    return hashlib.sha1(encode(block, canonical=True)).hexdigest()
+
+
+def get_config_hash(**config):
+    """
+    Returns a hash of the training configuration, eg. epochs, steps, batch size, optimizer, loss and metrics.
+    """
+    return hashlib.sha1(repr(canonical_value(config)).encode()).hexdigest()
+
+
+class FitnessCache:
+    """
+    A fitness cache stores the fitness of every evaluated architecture, keyed by the architecture's genome hash and the
+    training configuration used during evaluation. Evaluating an architecture that is structurally identical to a
+    previously evaluated one can thus return the cached fitness instead of building and training a keras model.
+
+    If a filename is given the cache is persisted in an SQLite database, allowing the cache to be shared between
+    processes, eg. pool workers, and between runs. Without a filename the cache is kept in memory.
+
+    The training data is not part of the cache key, a separate cache file should be used for each dataset.
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+        self.entries = {}
+        self._connection = None
+
+    def __getstate__(self):
+        # SQLite connections cannot be pickled, eg. when the cache is sent to pool workers, they are reopened lazily
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    def _get_connection(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.filename, timeout=60)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fitness "
+                "(key TEXT PRIMARY KEY, params REAL, accuracy REAL)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    @staticmethod
+    def get_key(block_architecture, **config):
+        return get_genome_hash(block_architecture) + get_config_hash(**config)
+
+    def get(self, key):
+        """
+        @return The cached (params, accuracy) fitness or None if the key has not been evaluated
+        """
+        if key in self.entries:
+            return self.entries[key]
+        if self.filename:
+            row = (
+                self._get_connection()
+                .execute("SELECT params, accuracy FROM fitness WHERE key = ?", (key,))
+                .fetchone()
+            )
+            if row:
+                self.entries[key] = row
+                return row
+        return None
+
+    def put(self, key, fitness):
+        params, accuracy = float(fitness[0]), float(fitness[1])
+        self.entries[key] = (params, accuracy)
+        if self.filename:
+            connection = self._get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO fitness VALUES (?, ?, ?)",
+                (key, params, accuracy),
+            )
+            connection.commit()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        if self.filename:
+            return (
+                self._get_connection()
+                .execute("SELECT COUNT(*) FROM fitness")
+                .fetchone()[0]
+            )
+        return len(self.entries)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
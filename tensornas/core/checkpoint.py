@@ -0,0 +1,135 @@
+import os
+import pickle
+import random
+import struct
+import zlib
+
+from tensornas.core.individual import decode_individual, encode_individual
+
+MAGIC = b"TNC\x01"
+
+# Each record is prefixed by its compressed length and the CRC32 of the compressed payload
+_record_header = struct.Struct("<II")
+
+
+class Checkpoint:
+    """
+    A checkpoint persists the state of an evolutionary run after each generation, allowing for a run to be resumed
+    after it was interrupted, see tensornas.core.algorithms.
+
+    The checkpoint file is append-only, each generation appends one compressed record holding the generation's
+    population, the hall of fame, eg. the Pareto archive, the logbook, the fitnesses evaluated during the generation
+    and the state of the random module. Individuals are stored as encoded genomes, see tensornas.core.genome, along with
+    their fitness values. A record that was only partially written, eg. due to a crash, is ignored when loading, the
+    run is then resumed from the preceding generation.
+
+    Resuming restores the exact state of the search, however the training of the evaluated architectures is not
+    seeded, as such the fitnesses of newly evaluated architectures can differ from those of the interrupted run unless
+    they are cached, see FitnessCache.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def save(self, generation, population, halloffame=None, logbook=None, evaluated=()):
+        """
+        Appends a record of the state after a generation to the checkpoint file. The file is synced to disk before
+        returning.
+
+        @param evaluated The fitnesses evaluated during the generation
+        """
+        record = {
+            "generation": generation,
+            "random_state": random.getstate(),
+            "population": [encode_individual(ind) for ind in population],
+            "halloffame": [encode_individual(ind) for ind in halloffame]
+            if halloffame is not None
+            else None,
+            "logbook": logbook,
+            "evaluated": [tuple(fitness) for fitness in evaluated],
+        }
+        payload = zlib.compress(pickle.dumps(record, pickle.HIGHEST_PROTOCOL))
+
+        with open(self.filename, "ab") as f:
+            if not f.tell():
+                f.write(MAGIC)
+            f.write(_record_header.pack(len(payload), zlib.crc32(payload)))
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_payloads(self):
+        """
+        Yields the compressed payload of each complete record along with the file offset at which the record ends.
+        """
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if not magic:
+                return
+            if magic != MAGIC:
+                raise ValueError("{} is not a checkpoint file".format(self.filename))
+            yield None, f.tell()
+            while True:
+                header = f.read(_record_header.size)
+                if len(header) < _record_header.size:
+                    return
+                length, crc = _record_header.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    return
+                yield payload, f.tell()
+
+    def records(self):
+        """
+        Yields the complete records of the checkpoint file in the order they were saved, stopping at the first
+        incomplete or corrupt record.
+        """
+        for payload, _ in self._read_payloads():
+            if payload is not None:
+                yield pickle.loads(zlib.decompress(payload))
+
+    def load(self):
+        """
+        Returns the last complete record. An incomplete or corrupt record following it is truncated from the file,
+        such that the records saved by the resumed run directly follow the last complete record.
+
+        @return The last complete record or None if no generation was checkpointed
+        """
+        payload = None
+        end = None
+        for payload, end in self._read_payloads():
+            pass
+        if end is not None and end < os.path.getsize(self.filename):
+            with open(self.filename, "r+b") as f:
+                f.truncate(end)
+        if payload is None:
+            return None
+        return pickle.loads(zlib.decompress(payload))
+
+    def get_evaluated(self):
+        """
+        @return The fitnesses evaluated during every checkpointed generation
+        """
+        return [fitness for record in self.records() for fitness in record["evaluated"]]
+
+    def restore(self, record, individual_class, halloffame=None):
+        """
+        Restores the state saved in a record, the random module's state is restored and the hall of fame is refilled
+        with the record's individuals.
+
+        @param individual_class Class of the individuals, eg. the DEAP creator's Individual class, which is created by
+        passing an iterator over the individual's block architecture
+        @return Tuple of the population and logbook
+        """
+        population = [
+            decode_individual(entry, individual_class)
+            for entry in record["population"]
+        ]
+        if halloffame is not None and record["halloffame"] is not None:
+            halloffame.clear()
+            for entry in record["halloffame"]:
+                halloffame.insert(decode_individual(entry, individual_class))
+        random.setstate(record["random_state"])
+        return population, record["logbook"]
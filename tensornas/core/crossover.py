@@ -1,34 +1,38 @@
 # Note: please take note of arguments and return forms!
 def crossover_individuals_sp(ind1, ind2):
     """
-    A pythonic approach to crossing over, as invalid architectures are created by some crossovers, crossing over is
-    repeated until a valid architecture is produced.
+    Crosses over clones of two individuals using single point crossover. As swap points are only chosen among
+    shape-compatible blocks, see crossover_single_point, the crossover succeeds on the first attempt. The individuals
+    are cloned copy-on-write, such that only the blocks along the paths to the swapped blocks are copied.
     """
-    from copy import deepcopy
     from tensornas.core.crossover import crossover_single_point
 
-    while True:
-        try:
-            ind3, ind4 = deepcopy(ind1), deepcopy(ind2)
-            ind3.block_architecture, ind4.block_architecture = crossover_single_point(
-                ind3.block_architecture, ind4.block_architecture
-            )
-        except Exception:
-            continue
-        break
+    ind3, ind4 = ind1.clone(), ind2.clone()
+    ind3.block_architecture, ind4.block_architecture = crossover_single_point(
+        ind3.block_architecture, ind4.block_architecture
+    )
     return ind3, ind4
 
 
 def crossover_single_point(b1, b2):
     """
-    A single block between the two architectures is swapped. Care should be taken as the crossover can raise exceptions
-    if an invalid architecture is generated.
+    A single block between the two architectures is swapped. The swapped blocks are chosen uniformly at random among
+    the pairs of blocks that share both input and output shapes, such that the I/O shapes of neither architecture
+    change. If no such pair exists, blocks sharing only their input shape are swapped and the following blocks' shapes
+    are refreshed, which can produce an invalid architecture, see Block.validate. If the architectures share no
+    compatible blocks they are returned unchanged.
 
     @param b1 First block architecture to be crossed-over
     @param b2 Second block architecture to be crossed-over
     """
-    random_node_1 = _select_random_node(b1)
-    random_node_2 = _select_random_node(b2)
+    pair = _select_compatible_nodes(b1, b2)
+    if not pair:
+        return b1, b2
+    # The blocks along the paths to the swapped blocks are modified and must thus be owned by the architectures
+    random_node_1, random_node_2 = _own_path(b1, pair[0]), _own_path(b2, pair[1])
+
+    output_shape_1 = random_node_1.output_shape
+    output_shape_2 = random_node_2.output_shape
 
     index_1 = random_node_1.get_index_in_parent()
     index_2 = random_node_2.get_index_in_parent()
@@ -42,12 +46,91 @@ def crossover_single_point(b1, b2):
     parent_1.set_block_at_index(index_1, random_node_2)
     parent_2.set_block_at_index(index_2, random_node_1)
 
-    random_node_1.reset_ba_input_shapes()
-    random_node_2.reset_ba_input_shapes()
+    random_node_1.propagate_io_shapes(prev_output_shape=output_shape_2)
+    random_node_2.propagate_io_shapes(prev_output_shape=output_shape_1)
 
+    _merge_lineages(b1, b2)
     return b1, b2
 
 
+def _merge_lineages(b1, b2):
+    # The swapped blocks can inherit the weights trained by the other architecture's ancestors, see WeightStore
+    from tensornas.core.blockarchitecture import BlockArchitecture
+
+    if isinstance(b1, BlockArchitecture) and isinstance(b2, BlockArchitecture):
+        lineage_1, lineage_2 = b1.get_lineage(), b2.get_lineage()
+        b1.merge_lineage(lineage_2)
+        b2.merge_lineage(lineage_1)
+
+
+def _index_nodes(ba):
+    """
+    Indexes every block of a block architecture, excluding the architecture itself, by its (input_shape, output_shape).
+    Blocks are identified by their path, as the parent_block of shared blocks is not set, see Block.clone.
+
+    @return Dict mapping (input_shape, output_shape) tuples to lists of paths, each a tuple of sub-block indices
+    """
+    from tensornas.core.util import shape_tuple
+
+    index = {}
+    stack = [((), ba)]
+    while stack:
+        path, block = stack.pop()
+        for i, sb in enumerate(
+            block.input_blocks + block.middle_blocks + block.output_blocks
+        ):
+            key = (shape_tuple(sb.input_shape), shape_tuple(sb.output_shape))
+            index.setdefault(key, []).append(path + (i,))
+            stack.append((path + (i,), sb))
+    return index
+
+
+def _own_path(ba, path):
+    """
+    Takes ownership of the blocks along a path, see _index_nodes, returning the block at the end of the path.
+    """
+    block = ba
+    for i in path:
+        block = block._own_sub_block(
+            (block.input_blocks + block.middle_blocks + block.output_blocks)[i]
+        )
+    return block
+
+
+def _select_compatible_nodes(b1, b2):
+    """
+    Selects a random pair of blocks, one from each block architecture, that can be swapped. Every pair of blocks with
+    matching I/O shapes is equally likely to be selected, if there is no such pair then every pair of blocks with
+    matching input shapes is.
+
+    @return Tuple of the paths of the selected blocks or None if the architectures share no compatible blocks
+    """
+    import random
+
+    index_1 = _index_nodes(b1)
+    index_2 = _index_nodes(b2)
+
+    candidates = [(index_1[key], index_2[key]) for key in index_1 if key in index_2]
+    if not candidates:
+        inputs_2 = {}
+        for (input_shape, _), nodes in index_2.items():
+            inputs_2.setdefault(input_shape, []).extend(nodes)
+        inputs_1 = {}
+        for (input_shape, _), nodes in index_1.items():
+            inputs_1.setdefault(input_shape, []).extend(nodes)
+        candidates = [
+            (inputs_1[key], inputs_2[key]) for key in inputs_1 if key in inputs_2
+        ]
+    if not candidates:
+        return None
+
+    # Each key is weighted by its number of pairs such that every pair is equally likely
+    nodes_1, nodes_2 = random.choices(
+        candidates, weights=[len(n1) * len(n2) for n1, n2 in candidates]
+    )[0]
+    return random.choice(nodes_1), random.choice(nodes_2)
+
+
 def _get_max_depth(ba):
     from tensornas.core.layerblock import LayerBlock
 
@@ -94,6 +177,10 @@ def crossover_cutting_point(b1, b2, depth=1):
 
     assert depth > 0
 
+    # Blocks are moved using their parent_block, which is only set for owned blocks
+    b1._own_all_sub_blocks()
+    b2._own_all_sub_blocks()
+
     depth_1 = _get_max_depth(b1)
     depth_2 = _get_max_depth(b2)
 
@@ -132,6 +219,7 @@ def crossover_cutting_point(b1, b2, depth=1):
     parent_1.reset_ba_input_shapes()
     parent_2.reset_ba_input_shapes()
 
+    _merge_lineages(b1, b2)
     return b1, b2
 
 
@@ -0,0 +1,202 @@
+import os
+import tempfile
+
+import numpy as np
+
+
+class DatasetStore:
+    """
+    A dataset store persists preprocessed (train_data, train_labels, test_data, test_labels) arrays as .npy files
+    within a directory, which are then opened as read-only memory-mapped arrays. Evaluation workers that load the
+    dataset from the store thus share the operating system's single cached copy of the data instead of each holding
+    their own, see Dataset for how memory-mapped arrays are fed to training without being copied.
+
+    The store does not know how the data was created, a store whose directory holds arrays of a different dataset or
+    preprocessing must be cleared by deleting the directory.
+    """
+
+    NAMES = ("train_data", "train_labels", "test_data", "test_labels")
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _get_filename(self, name):
+        return os.path.join(self.directory, name + ".npy")
+
+    def exists(self):
+        return all(os.path.exists(self._get_filename(name)) for name in self.NAMES)
+
+    def save(self, arrays):
+        os.makedirs(self.directory, exist_ok=True)
+        for name, array in zip(self.NAMES, arrays):
+            # Written to a temporary file first such that concurrent readers never see a partially written file
+            fd, tmp_filename = tempfile.mkstemp(dir=self.directory, suffix=".npy")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(tmp_filename, self._get_filename(name))
+
+    def load(self):
+        """
+        @return Tuple of the memory-mapped arrays
+        """
+        return tuple(
+            np.load(self._get_filename(name), mmap_mode="r") for name in self.NAMES
+        )
+
+    def get(self, loader):
+        """
+        Loads the arrays from the store, if the store is empty the arrays are first created using loader and saved.
+        Concurrent callers, eg. the workers of an EvaluationPool, wait for the first caller to fill the store instead
+        of each creating the arrays.
+
+        @param loader Callable returning the tuple (train_data, train_labels, test_data, test_labels)
+        @return Tuple of the memory-mapped arrays
+        """
+        if not self.exists():
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, ".lock"), "wb") as lock:
+                try:
+                    import fcntl
+
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                except ImportError:
+                    pass
+                if not self.exists():
+                    self.save(loader())
+        return self.load()
+
+
+class Dataset:
+    """
+    The training and test data of an evaluation as tf.data pipelines, which are built once and reused for every
+    architecture evaluated, eg. by an evaluation worker, see EvaluationPool.
+
+    The arrays are converted to tensors once, when the first pipeline is built, instead of by every call to
+    model.fit. Training pipelines are shuffled, batched and prefetched, and are repeated such that training is bounded
+    by the number of steps. A pipeline is built for each combination of batch size and number of training samples
+    used and is then kept for later evaluations, all pipelines share the converted tensors instead of each caching
+    its own copy of the data.
+
+    Memory-mapped arrays, eg. loaded from a DatasetStore, are not converted to tensors as that would copy the data into
+    each process, their batches are instead gathered from the mapped arrays as they are consumed.
+    """
+
+    def __init__(
+        self,
+        train_data,
+        train_labels,
+        test_data,
+        test_labels,
+        shuffle_buffer=None,
+        test_batch_size=256,
+    ):
+        """
+        @param shuffle_buffer The size of the shuffle buffer, by default the number of training samples, ie. a full
+        shuffle
+        @param test_batch_size The batch size used to test the trained models, which does not affect the accuracy
+        """
+        self.train_data = train_data
+        self.train_labels = train_labels
+        self.test_data = test_data
+        self.test_labels = test_labels
+        self.shuffle_buffer = shuffle_buffer
+        self.test_batch_size = test_batch_size
+        self._train_slices = None
+        self._train_pipelines = {}
+        self._test_pipeline = None
+
+    def __len__(self):
+        return len(self.train_data)
+
+    @staticmethod
+    def _is_mapped(*arrays):
+        return any(isinstance(array, np.memmap) for array in arrays)
+
+    @staticmethod
+    def _get_mapped_pipeline(data, labels, batch_size, size, train):
+        """
+        Builds a pipeline of the batches of the first size samples of memory-mapped arrays. Training pipelines are
+        shuffled and repeated, test pipelines yield the samples once and in order.
+        """
+        import tensorflow as tf
+
+        def generate_batches():
+            if not train:
+                for start in range(0, size, batch_size):
+                    end = start + batch_size
+                    yield data[start:end], labels[start:end]
+                return
+
+            rng = np.random.default_rng()
+            order = np.empty(0, dtype=np.int64)
+            while True:
+                # Epochs run into each other such that every batch is full, as with the in-memory pipelines
+                while len(order) < batch_size:
+                    order = np.concatenate((order, rng.permutation(size)))
+                # Sorted indices read the mapped pages sequentially
+                indices = np.sort(order[:batch_size])
+                order = order[batch_size:]
+                yield data[indices], labels[indices]
+
+        return tf.data.Dataset.from_generator(
+            generate_batches,
+            output_signature=(
+                tf.TensorSpec((None,) + data.shape[1:], data.dtype),
+                tf.TensorSpec((None,) + labels.shape[1:], labels.dtype),
+            ),
+        ).prefetch(tf.data.AUTOTUNE)
+
+    def get_train(self, batch_size, train_size=None):
+        """
+        @param train_size The number of training samples used, by default all
+        @return Repeated tf.data.Dataset of shuffled (data, labels) batches
+        """
+        import tensorflow as tf
+
+        if train_size is None or train_size > len(self):
+            train_size = len(self)
+        key = (batch_size, train_size)
+        pipeline = self._train_pipelines.get(key)
+        if pipeline is None and self._is_mapped(self.train_data, self.train_labels):
+            pipeline = self._get_mapped_pipeline(
+                self.train_data, self.train_labels, batch_size, train_size, True
+            )
+            self._train_pipelines[key] = pipeline
+        elif pipeline is None:
+            if self._train_slices is None:
+                self._train_slices = tf.data.Dataset.from_tensor_slices(
+                    (self.train_data, self.train_labels)
+                )
+            pipeline = (
+                self._train_slices.take(train_size)
+                .shuffle(min(self.shuffle_buffer or train_size, train_size))
+                .repeat()
+                .batch(batch_size)
+                .prefetch(tf.data.AUTOTUNE)
+            )
+            self._train_pipelines[key] = pipeline
+        return pipeline
+
+    def get_test(self):
+        """
+        @return tf.data.Dataset of (data, labels) batches
+        """
+        import tensorflow as tf
+
+        if self._test_pipeline is None and self._is_mapped(
+            self.test_data, self.test_labels
+        ):
+            self._test_pipeline = self._get_mapped_pipeline(
+                self.test_data,
+                self.test_labels,
+                self.test_batch_size,
+                len(self.test_data),
+                False,
+            )
+        elif self._test_pipeline is None:
+            self._test_pipeline = (
+                tf.data.Dataset.from_tensor_slices((self.test_data, self.test_labels))
+                .batch(self.test_batch_size)
+                .prefetch(tf.data.AUTOTUNE)
+            )
+        return self._test_pipeline
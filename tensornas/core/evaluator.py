@@ -0,0 +1,190 @@
+import multiprocessing
+import os
+
+import numpy as np
+
+# State of an evaluation worker process, populated once by _init_worker when the worker is started
+_worker = {}
+
+
+def _get_worker_cpus(index, worker_count):
+    """
+    Splits the CPUs available to the process into equally sized shares, returning the share of the worker with the
+    given index.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count()))
+    share = max(1, len(cpus) // worker_count)
+    start = (index * share) % len(cpus)
+    return cpus[start : start + share]
+
+
+def _init_worker(counter, worker_count, data_loader, config, cache):
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+
+    cpus = _get_worker_cpus(index, worker_count)
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(len(cpus))
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    # Workers share the GPUs, as such memory is only allocated as required
+    for gpu in tf.config.list_physical_devices("GPU"):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    from tensornas.core.dataset import Dataset
+
+    train_data, train_labels, test_data, test_labels = data_loader()
+
+    _worker.update(
+        index=index,
+        train_data=train_data,
+        train_labels=train_labels,
+        test_data=test_data,
+        test_labels=test_labels,
+        # The tf.data pipelines are built once and reused for every architecture the worker evaluates
+        dataset=Dataset(train_data, train_labels, test_data, test_labels),
+        config=config,
+        cache=cache,
+    )
+
+
+def _evaluate_genome(genome, train_size=None, **overrides):
+    from tensornas.core.genome import decode
+
+    block_architecture = decode(genome)
+    config = dict(_worker["config"], **overrides)
+    return tuple(
+        block_architecture.evaluate(
+            train_data=_worker["train_data"][:train_size],
+            train_labels=_worker["train_labels"][:train_size],
+            test_data=_worker["test_data"],
+            test_labels=_worker["test_labels"],
+            cache=_worker["cache"],
+            dataset=_worker["dataset"],
+            **config
+        )
+    )
+
+
+def _evaluate_genome_star(args):
+    genome, overrides = args
+    return _evaluate_genome(genome, **overrides)
+
+
+class EvaluationPool:
+    """
+    A pool of persistent worker processes that evaluate block architectures.
+
+    The workers are started using the spawn start method, such that no TensorFlow state is inherited from the parent
+    process. Each worker imports TensorFlow once, restricts itself and TensorFlow's thread pools to its share of the
+    available CPUs and loads the dataset once using data_loader, see Dataset. Only the encoded block architecture, see
+    tensornas.core.genome, is sent to a worker for each evaluation and only the resulting (params, accuracy) tuple is
+    returned.
+
+    data_loader must be a picklable callable, ie. a module level function, that returns the tuple
+    (train_data, train_labels, test_data, test_labels). The remaining keyword arguments are the training
+    configuration passed to BlockArchitecture.evaluate, eg. epochs, steps, batch_size, optimizer, loss and metrics,
+    along with an optional weight_store, see WeightStore for how the store is shared between the workers.
+
+    As the pool starts new interpreters, the pool should only be created from within an
+    `if __name__ == "__main__":` guarded section of a script.
+    """
+
+    def __init__(self, data_loader, workers=None, cache=None, **config):
+        self.workers = workers or os.cpu_count()
+        self.cache = cache
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(context.Value("i", 0), self.workers, data_loader, config, cache),
+        )
+
+    def evaluate(self, block_architectures, **overrides):
+        """
+        Evaluates a list of block architectures, returning their fitnesses in the same order. Structurally identical
+        architectures are only sent to the workers once, architectures that fail validation are not sent at all.
+
+        @param overrides Training configuration values that replace the pool's configuration for this call, eg. a
+        reduced number of steps. The additional train_size argument limits training to the first train_size samples.
+        """
+        from tensornas.core.cache import get_genome_hash
+        from tensornas.core.genome import encode
+
+        unique = {}
+        hashes = []
+        fitnesses = {}
+        for ba in block_architectures:
+            genome_hash = get_genome_hash(ba)
+            if genome_hash not in unique and genome_hash not in fitnesses:
+                if ba.validate():
+                    unique[genome_hash] = encode(ba)
+                else:
+                    fitnesses[genome_hash] = (np.inf, 0)
+            hashes.append(genome_hash)
+
+        fitnesses.update(
+            zip(
+                unique.keys(),
+                self.pool.map(
+                    _evaluate_genome_star,
+                    [(genome, overrides) for genome in unique.values()],
+                    chunksize=1,
+                ),
+            )
+        )
+        return [fitnesses[genome_hash] for genome_hash in hashes]
+
+    def submit(self, block_architecture, callback, **overrides):
+        """
+        Evaluates a block architecture asynchronously, the architecture is queued to be evaluated by the next free
+        worker. Architectures that fail validation are not sent to a worker, the callback is then called immediately.
+
+        @param callback Called with the architecture's fitness once evaluated, note that the callback is called from
+        the pool's result handling thread and should thus return quickly, eg. by putting the fitness into a queue
+        """
+        from tensornas.core.genome import encode
+
+        if not block_architecture.validate():
+            callback((np.inf, 0))
+            return
+
+        def error_callback(e):
+            print("Error evaluating model, {}".format(e))
+            callback((np.inf, 0))
+
+        self.pool.apply_async(
+            _evaluate_genome_star,
+            ((encode(block_architecture), overrides),),
+            callback=callback,
+            error_callback=error_callback,
+        )
+
+    def evaluate_individuals(self, individuals, **overrides):
+        """
+        Evaluates the individuals' block architectures, see evaluate. The pool is used by a DEAP toolbox by registering
+        this method as the toolbox's evaluate_population function, see ea_nsga2.
+        """
+        return self.evaluate([ind.block_architecture for ind in individuals], **overrides)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def terminate(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.terminate()
@@ -0,0 +1,272 @@
+"""
+A compact binary encoding of block architectures, used to send architectures to evaluation workers, to hash them and
+to store them in checkpoints. Compared to pickling the object graph, the encoding is a flat pre-order list of blocks,
+each holding its type, block ID, I/O shapes and, for layer blocks, the layer's type and args. Enum members and
+type names are stored once in a string table.
+
+Layout: MAGIC, flags, string table, blocks. All integers are varints, values are tagged, see _Encoder.write_value.
+"""
+import struct
+import uuid
+from enum import Enum
+from functools import lru_cache
+from importlib import import_module
+from numbers import Integral, Real
+
+from tensornas.core.block import Block
+from tensornas.core.layer import LayerShape
+from tensornas.core.layerblock import LayerBlock
+
+MAGIC = b"TNG\x01"
+
+_FLAG_CANONICAL = 1
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _TUPLE, _LIST, _ENUM = range(9)
+
+# Slots that are encoded explicitly
+_SKIPPED_SLOTS = frozenset(Block.__slots__ + LayerBlock.__slots__)
+
+# Slots that, like block IDs, identify an architecture instead of describing it and are omitted by canonical encodings
+_IDENTITY_SLOTS = frozenset(("lineage",))
+
+_float = struct.Struct("<d")
+
+
+@lru_cache(maxsize=None)
+def _type_name(cls):
+    return "{}:{}".format(cls.__module__, cls.__qualname__)
+
+
+@lru_cache(maxsize=None)
+def _resolve_type(name):
+    module, qualname = name.split(":")
+    value = import_module(module)
+    for attr in qualname.split("."):
+        value = getattr(value, attr)
+    return value
+
+
+class _Encoder:
+    def __init__(self, canonical):
+        self.canonical = canonical
+        self.strings = {}
+        self.data = bytearray()
+
+    def get_bytes(self):
+        header = _Encoder(self.canonical)
+        header.data += MAGIC
+        header.data.append(_FLAG_CANONICAL if self.canonical else 0)
+        header.write_uint(len(self.strings))
+        for string in self.strings:
+            encoded = string.encode()
+            header.write_uint(len(encoded))
+            header.data += encoded
+        return bytes(header.data + self.data)
+
+    def write_uint(self, value):
+        while value > 0x7F:
+            self.data.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.data.append(value)
+
+    def write_string(self, string):
+        index = self.strings.get(string)
+        if index is None:
+            index = self.strings[string] = len(self.strings)
+        self.write_uint(index)
+
+    def write_int(self, value):
+        # Zigzag encoding such that small negative values, eg. -1 block types, stay small
+        self.write_uint(value << 1 if value >= 0 else ((-value) << 1) - 1)
+
+    def write_value(self, value):
+        # The exact types of the common values are checked first as the abstract type checks are comparatively slow
+        value_type = type(value)
+        if value_type is int:
+            self.data.append(_INT)
+            self.write_int(value)
+        elif value_type is tuple or value_type is list:
+            # Canonical encodings do not distinguish lists from tuples, see canonical_value
+            self.data.append(
+                _TUPLE if self.canonical or value_type is tuple else _LIST
+            )
+            self.write_uint(len(value))
+            for v in value:
+                self.write_value(v)
+        elif value is None:
+            self.data.append(_NONE)
+        elif value_type is bool:
+            self.data.append(_TRUE if value else _FALSE)
+        elif isinstance(value, Enum):
+            self.data.append(_ENUM)
+            self.write_string(_type_name(value_type))
+            self.write_string(value.name)
+        elif isinstance(value, str):
+            self.data.append(_STR)
+            self.write_string(value)
+        elif isinstance(value, Integral):
+            self.data.append(_INT)
+            self.write_int(int(value))
+        elif isinstance(value, Real):
+            self.data.append(_FLOAT)
+            self.data += _float.pack(value)
+        elif isinstance(value, (tuple, list)):
+            self.write_value(list(value) if isinstance(value, list) else tuple(value))
+        else:
+            raise TypeError("Unable to encode value of type {}".format(value_type))
+
+    def write_block(self, block):
+        cls = type(block)
+        self.write_string(_type_name(cls))
+        if not self.canonical:
+            self.data += bytes.fromhex(block.block_id)
+        self.write_value(block.layer_type)
+        self.write_value(block.input_shape)
+        self.write_value(block.output_shape)
+
+        extra = [
+            (name, getattr(block, name))
+            for name in cls._slot_names
+            if name not in _SKIPPED_SLOTS
+            and not (self.canonical and name in _IDENTITY_SLOTS)
+            and hasattr(block, name)
+        ]
+        self.write_uint(len(extra))
+        for name, value in extra:
+            self.write_string(name)
+            self.write_value(value)
+
+        if isinstance(block, LayerBlock):
+            layer = block.layer
+            self.write_string(_type_name(type(layer)))
+            args = list(layer.args.items())
+            if self.canonical:
+                args.sort(key=lambda arg: str(arg[0]))
+            self.write_uint(len(args))
+            for arg, value in args:
+                self.write_value(arg)
+                self.write_value(value)
+
+        for blocks in (block.input_blocks, block.middle_blocks, block.output_blocks):
+            self.write_uint(len(blocks))
+        for sb in block.input_blocks + block.middle_blocks + block.output_blocks:
+            self.write_block(sb)
+
+
+class _Decoder:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        if bytes(self.data[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Data is not an encoded genome")
+        self.pos = len(MAGIC) + 1
+        self.canonical = bool(self.data[len(MAGIC)] & _FLAG_CANONICAL)
+        self.strings = []
+        for _ in range(self.read_uint()):
+            length = self.read_uint()
+            self.strings.append(str(self.data[self.pos : self.pos + length], "utf-8"))
+            self.pos += length
+
+    def read_uint(self):
+        pos = self.pos
+        byte = self.data[pos]
+        if byte < 0x80:
+            self.pos = pos + 1
+            return byte
+        value = 0
+        shift = 0
+        while True:
+            byte = self.data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return value
+            shift += 7
+
+    def read_string(self):
+        return self.strings[self.read_uint()]
+
+    def read_value(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _INT:
+            value = self.read_uint()
+            return value >> 1 if not value & 1 else -((value + 1) >> 1)
+        if tag == _TUPLE:
+            return tuple([self.read_value() for _ in range(self.read_uint())])
+        if tag == _LIST:
+            return [self.read_value() for _ in range(self.read_uint())]
+        if tag == _NONE:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _ENUM:
+            enum = _resolve_type(self.read_string())
+            return enum[self.read_string()]
+        if tag == _STR:
+            return self.read_string()
+        if tag == _FLOAT:
+            value = _float.unpack_from(self.data, self.pos)[0]
+            self.pos += _float.size
+            return value
+        raise ValueError("Invalid value tag {}".format(tag))
+
+    def read_block(self, parent_block):
+        cls = _resolve_type(self.read_string())
+        block = object.__new__(cls)
+        if self.canonical:
+            # Canonical encodings hold no block IDs, the blocks are thus decoded as new blocks
+            block.block_id = uuid.uuid4().hex
+        else:
+            block.block_id = bytes(self.data[self.pos : self.pos + 16]).hex()
+            self.pos += 16
+        block.parent_block = parent_block
+        block.layer_type = self.read_value()
+        block.input_shape = self.read_value()
+        block.output_shape = self.read_value()
+
+        for _ in range(self.read_uint()):
+            setattr(block, self.read_string(), self.read_value())
+
+        if issubclass(cls, LayerBlock):
+            layer = object.__new__(_resolve_type(self.read_string()))
+            layer.args = {}
+            for _ in range(self.read_uint()):
+                arg = self.read_value()
+                layer.args[arg] = self.read_value()
+            # A layer's shapes are those of its layer block, see LayerBlock.set_input_shape
+            layer.inputshape = LayerShape(block.input_shape)
+            layer.outputshape = LayerShape(block.output_shape)
+            block.layer = layer
+
+        input_count, middle_count, output_count = (self.read_uint() for _ in range(3))
+        block.input_blocks = [self.read_block(block) for _ in range(input_count)]
+        block.middle_blocks = [self.read_block(block) for _ in range(middle_count)]
+        block.output_blocks = [self.read_block(block) for _ in range(output_count)]
+        return block
+
+
+def encode(block, canonical=False):
+    """
+    Encodes a block hierarchy, eg. a block architecture, into bytes.
+
+    @param canonical If True the block IDs and architecture lineages are omitted, lists are encoded as tuples and
+    layer args are sorted, such that structurally identical block hierarchies have identical encodings, eg. for
+    hashing
+    @return The encoded genome
+    """
+    encoder = _Encoder(canonical)
+    encoder.write_block(block)
+    return encoder.get_bytes()
+
+
+def decode(data):
+    """
+    Decodes an encoded genome, see encode, into a new block hierarchy. The hierarchy is not regenerated, ie. no
+    random sub-blocks or layer args are created, and keeps the encoded block IDs.
+
+    @return The root block of the decoded hierarchy
+    """
+    return _Decoder(data).read_block(None)
@@ -13,6 +13,22 @@ class Individual:
 
     def __init__(self, block_architecture):
         self.block_architecture = next(block_architecture)
+        # Index of the training budget the fitness was evaluated with when using multi-fidelity evaluation
+        self.fidelity = None
+
+    def clone(self):
+        """
+        Returns a clone of the individual whose block architecture is cloned copy-on-write, see Block.clone, all other
+        attributes, eg. the fitness, are deep copied. Can be registered as the DEAP toolbox's clone function.
+        """
+        from copy import copy, deepcopy
+
+        ind = copy(self)
+        for name, value in vars(self).items():
+            if name != "block_architecture":
+                setattr(ind, name, deepcopy(value))
+        ind.block_architecture = self.block_architecture.clone()
+        return ind
 
     def mutate(self, verbose=False):
         self.block_architecture.mutate(verbose=verbose)
@@ -30,6 +46,9 @@ class Individual:
         optimizer,
         loss,
         metrics,
+        cache=None,
+        max_params=None,
+        weight_store=None,
     ):
         return self.block_architecture.evaluate(
             train_data=train_data,
@@ -42,6 +61,14 @@ class Individual:
             optimizer=optimizer,
             loss=loss,
             metrics=metrics,
+            cache=cache,
+            max_params=max_params,
+            weight_store=weight_store,
+        )
+
+    def evaluate_zero_cost(self, data, labels, loss, proxy="jacob_cov", batch_size=32):
+        return self.block_architecture.evaluate_zero_cost(
+            data=data, labels=labels, loss=loss, proxy=proxy, batch_size=batch_size
         )
 
     def print(self):
@@ -49,3 +76,34 @@ class Individual:
 
     def print_tree(self):
         print(self.block_architecture.get_ascii_tree())
+
+
+def encode_individual(ind):
+    """
+    Encodes an individual as its encoded block architecture, see tensornas.core.genome, its fitness values, or None
+    if the fitness is invalid, and its fidelity.
+    """
+    from tensornas.core.genome import encode
+
+    return (
+        encode(ind.block_architecture),
+        tuple(ind.fitness.values) if ind.fitness.valid else None,
+        getattr(ind, "fidelity", None),
+    )
+
+
+def decode_individual(encoded, individual_class):
+    """
+    Decodes an individual encoded using encode_individual.
+
+    @param individual_class Class of the individual, eg. the DEAP creator's Individual class, which is created by
+    passing an iterator over the individual's block architecture
+    """
+    from tensornas.core.genome import decode
+
+    genome, values, fidelity = encoded
+    ind = individual_class(iter([decode(genome)]))
+    if values is not None:
+        ind.fitness.values = values
+    ind.fidelity = fidelity
+    return ind
@@ -0,0 +1,200 @@
+"""
+Island model evolution, where independent populations evolve in separate processes and periodically exchange their
+best individuals, see run_islands.
+"""
+import multiprocessing
+import os
+import queue
+import random
+
+
+def _receive_migrants(inbox, individual_class):
+    """
+    Decodes the migrants that have arrived at an island without waiting for more.
+    """
+    from tensornas.core.individual import decode_individual
+
+    migrants = []
+    while True:
+        try:
+            encoded = inbox.get_nowait()
+        except queue.Empty:
+            return migrants
+        migrants.extend(
+            decode_individual(entry, individual_class) for entry in encoded
+        )
+
+
+def _run_island(
+    island,
+    island_count,
+    setup,
+    data_loader,
+    workers,
+    config,
+    cxpb,
+    mutpb,
+    ngen,
+    migration_interval,
+    migrant_count,
+    inbox,
+    outbox,
+    results,
+    seed,
+    verbose,
+):
+    from tensornas.core.algorithms import ea_nsga2
+    from tensornas.core.evaluator import EvaluationPool, _get_worker_cpus
+    from tensornas.core.individual import encode_individual
+    from tensornas.core.pareto import ParetoArchive
+
+    # The island's evaluation workers split the island's share of the CPUs between them
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, _get_worker_cpus(island, island_count))
+
+    # Migrants still buffered when the island finishes are discarded instead of blocking the island's exit
+    outbox.cancel_join_thread()
+
+    if seed is not None:
+        random.seed(seed + island)
+
+    toolbox, population = setup(island)
+    individual_class = type(population[0])
+    halloffame = ParetoArchive()
+
+    with EvaluationPool(data_loader, workers=workers, **config) as pool:
+        toolbox.register("evaluate_population", pool.evaluate_individuals)
+
+        gen = 0
+        while gen < ngen:
+            epoch = min(migration_interval, ngen - gen)
+            population, _ = ea_nsga2(
+                population,
+                toolbox,
+                cxpb,
+                mutpb,
+                epoch,
+                halloffame=halloffame,
+                verbose=False,
+            )
+            gen += epoch
+            if gen >= ngen:
+                break
+
+            emigrants = toolbox.select(population, migrant_count)
+            outbox.put([encode_individual(ind) for ind in emigrants])
+
+            immigrants = _receive_migrants(inbox, individual_class)
+            if immigrants:
+                halloffame.update(immigrants)
+                population[:] = toolbox.select(population + immigrants, len(population))
+            if verbose:
+                print(
+                    "[ISLAND] island {} generation {}, {} immigrants".format(
+                        island, gen, len(immigrants)
+                    )
+                )
+
+    results.put((island, [encode_individual(ind) for ind in halloffame]))
+
+
+def run_islands(
+    setup,
+    data_loader,
+    island_count,
+    cxpb,
+    mutpb,
+    ngen,
+    migration_interval,
+    migrant_count,
+    workers=None,
+    seed=None,
+    verbose=__debug__,
+    **config
+):
+    """
+    Evolves island_count independent populations, each in its own process using the NSGA-II algorithm, see ea_nsga2.
+    Every migration_interval generations each island sends its migrant_count best individuals, as selected by the
+    toolbox's select operator, to the next island of a ring and replaces its worst individuals by the migrants it has
+    received. Migrants are sent as encoded genomes along with their fitnesses, see tensornas.core.genome, and are not
+    waited for, an island continues evolving if its neighbour's migrants have not arrived yet.
+
+    Each island evaluates its individuals using its own EvaluationPool, restricted to the island's share of the CPUs,
+    the workers are split equally between the islands.
+
+    setup must be a picklable callable, ie. a module level function, which is called with the island's index within the
+    island's process and returns the tuple (toolbox, population). The toolbox's mate, mutate and clone operators are
+    used to vary the population, eg. crossover_individuals_sp and Individual.mutate, and its select operator should be
+    sel_nsga2. The individuals are evaluated by the island's evaluation pool, which is registered as the toolbox's
+    evaluate_population function, see EvaluationPool.evaluate_individuals. data_loader and the remaining keyword
+    arguments are passed to each island's EvaluationPool.
+
+    As new interpreters are started, the islands should only be run from within an `if __name__ == "__main__":`
+    guarded section of a script.
+
+    @param seed If given, each island seeds the random module with the seed plus the island's index
+    @return ParetoArchive of the non-dominated block architectures found by all islands
+    """
+    from tensornas.core.genome import decode
+    from tensornas.core.pareto import ParetoArchive
+
+    context = multiprocessing.get_context("spawn")
+    inboxes = [context.Queue() for _ in range(island_count)]
+    results = context.Queue()
+    island_workers = max(1, (workers or os.cpu_count()) // island_count)
+
+    # Islands are not daemonic as each starts its own pool of evaluation workers
+    islands = [
+        context.Process(
+            target=_run_island,
+            args=(
+                island,
+                island_count,
+                setup,
+                data_loader,
+                island_workers,
+                config,
+                cxpb,
+                mutpb,
+                ngen,
+                migration_interval,
+                migrant_count,
+                inboxes[island],
+                inboxes[(island + 1) % island_count],
+                results,
+                seed,
+                verbose,
+            ),
+        )
+        for island in range(island_count)
+    ]
+    for process in islands:
+        process.start()
+
+    archive = ParetoArchive()
+    finished = 0
+    try:
+        while finished < island_count:
+            try:
+                island, encoded = results.get(timeout=1)
+            except queue.Empty:
+                for island, process in enumerate(islands):
+                    if process.exitcode not in (None, 0):
+                        raise RuntimeError(
+                            "Island {} exited with code {}".format(
+                                island, process.exitcode
+                            )
+                        )
+                continue
+            for genome, values, _ in encoded:
+                archive.insert(decode(genome), values)
+            finished += 1
+            if verbose:
+                print("[ISLAND] island {} finished".format(island))
+    finally:
+        for process in islands:
+            if finished < island_count:
+                process.terminate()
+            process.join()
+
+    return archive
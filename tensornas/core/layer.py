@@ -1,10 +1,19 @@
 import importlib
-import random
 import re
+import sys
 from abc import ABC, abstractmethod
 
+from tensornas.core.util import (
+    canonical_value,
+    choose_mutation_operator,
+    get_mutation_operators,
+    shape_tuple,
+)
+
 
 class LayerShape:
+    __slots__ = ("dimensions",)
+
     def __init__(self, dimensions=None):
         self.dimensions = dimensions
 
@@ -44,28 +53,53 @@ class NetworkLayer(ABC):
     Mutating:
     Mutation happens by randomly calling a mutation function implemented within the class, ideally each implemented
     function should mutate one property of the layer that the class represents. Calling of these mutation functions is
-    done through naming convention, each mutation function should be prefixed with '_mutate'.
+    done through naming convention, each mutation function should be prefixed with '_mutate'. The table of mutation
+    functions is built once, when the class is defined. The optional MUTATION_WEIGHTS dict maps mutation function
+    names to their relative selection weights, eg. `MUTATION_WEIGHTS = {"_mutate_filters": 2}`.
 
     Args:
     Each network layer needs an enum.Enum where all of the possible arguments are listed. It must have the name Args
     and be in the same module as the Layer class. If the layer is a sub-class of a Keras type layed, eg. a hidden Dense
     layer then the Args enum can be placed inside the parent sub-package such that it can be shared between the
     sub-classed layers.
+
+    Memory:
+    As full population histories can be kept in memory, layers use __slots__ and the metadata shared by all instances
+    of a layer class, ie. the Args enum and the mutation functions, is stored once on the class. Sub-classes should
+    thus also define __slots__, listing any additional instance attributes.
     """
 
+    __slots__ = ("args", "inputshape", "outputshape")
+
+    MUTATION_WEIGHTS = {}
+
+    _mutation_operators = ()
+    _mutation_weights = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._mutation_operators, cls._mutation_weights = get_mutation_operators(
+            cls, r"^_mutate"
+        )
+        # The name, parent name and Args enum are resolved once when the layer plugin is defined instead of for
+        # every layer instance. The Args enum can only be resolved if it is defined before the Layer class, otherwise
+        # it is resolved lazily.
+        cls._name = cls._resolve_name()
+        cls._parent_name = cls._resolve_parent_name()
+        cls._args_enum = cls._find_args_enum()
+
     def __init__(self, input_shape, args=None):
-        self.args_enum = self._get_args_enum()
         self.args = self._gen_args(input_shape, args)
-        self.inputshape = LayerShape()
-        self.outputshape = LayerShape()
-        self.mutation_funcs = [
-            func
-            for func in dir(self)
-            if callable(getattr(self, func)) and re.search(r"^_mutate", func)
-        ]
+        self.inputshape = LayerShape(input_shape)
+        self.outputshape = LayerShape(self.get_output_shape())
 
-        self.inputshape.set(input_shape)
-        self.outputshape.set(self.get_output_shape())
+    @property
+    def mutation_funcs(self):
+        return tuple(name for name, _ in self._mutation_operators)
+
+    @property
+    def args_enum(self):
+        return self._get_args_enum()
 
     @classmethod
     def _get_module(cls):
@@ -87,38 +121,64 @@ class NetworkLayer(ABC):
                 return ret[0]
 
     @classmethod
-    def get_parent_name(cls):
-        ret = re.findall(r".*\.([a-zA-Z0-9]*$)", cls._get_parent_module())
-        if len(ret):
-            return ret[0]
-        else:
-            return None
+    def _resolve_parent_name(cls):
+        parent_module = cls._get_parent_module()
+        if parent_module:
+            ret = re.findall(r".*\.([a-zA-Z0-9]*$)", parent_module)
+            if len(ret):
+                return ret[0]
+        return None
 
     @classmethod
-    def get_name(cls):
+    def _resolve_name(cls):
         ret = cls._get_m_name()
         if ret:
             if len(ret) >= 2:
                 return ret[1]
 
+    @classmethod
+    def _find_args_enum(cls):
+        # The layer's module is in sys.modules while it is being executed, thus this does not trigger any imports
+        for module_name in (cls._get_module(), cls._get_parent_module()):
+            args = getattr(sys.modules.get(module_name), "Args", None)
+            if args is not None:
+                return args
+        return None
+
+    @classmethod
+    def get_parent_name(cls):
+        if "_parent_name" not in cls.__dict__:
+            cls._parent_name = cls._resolve_parent_name()
+        return cls._parent_name
+
+    @classmethod
+    def get_name(cls):
+        if "_name" not in cls.__dict__:
+            cls._name = cls._resolve_name()
+        return cls._name
+
     @classmethod
     def _get_args_enum(cls):
+        args = cls.__dict__.get("_args_enum")
+        if args is not None:
+            return args
         try:
             args = importlib.import_module(cls._get_module()).Args
-            return args
         except Exception:
             try:
                 args = importlib.import_module(cls._get_parent_module()).Args
-                return args
-            except Exception as e:
-                raise (
+            except Exception:
+                raise Exception(
                     "{} doesn't have args enum.Enum 'Args' implemented".format(
                         cls.get_name()
                     )
                 )
+        cls._args_enum = args
+        return args
 
-    def get_args_enum(self):
-        return self.args_enum
+    @classmethod
+    def get_args_enum(cls):
+        return cls._get_args_enum()
 
     def print(self):
         print(
@@ -138,12 +198,78 @@ class NetworkLayer(ABC):
             pass
         print("")
 
+    def param_count(self):
+        """
+        Returns the number of parameters, trainable and non-trainable, that the keras layer will have. The count is
+        derived from the layer's args and input shape such that no keras layer needs to be built. Layers without
+        weights do not need to override this method.
+        """
+        return 0
+
+    def flops(self):
+        """
+        Returns the number of floating point operations required for a single inference of the layer, a
+        multiply-accumulate being counted as two operations. Like param_count, this is derived purely from the
+        layer's args and input shape.
+        """
+        return 0
+
+    def get_validation_errors(self):
+        """
+        Statically checks the layer's args and I/O shapes, by default that the shapes do not contain non-positive
+        dimensions. Layers with further constraints, eg. on the divisibility of their input channels, should extend
+        this method.
+
+        @return List of descriptions of the violated constraints, empty if the layer is valid
+        """
+        errors = []
+        for name, shape in (
+            ("input", self.inputshape.dimensions),
+            ("output", self.get_output_shape()),
+        ):
+            if any(dim < 1 for dim in shape_tuple(shape)):
+                errors.append("non-positive {} dimension in {}".format(name, shape))
+        return errors
+
+    def repair(self):
+        """
+        Called after the layer's input shape was changed, eg. by the mutation of a preceding layer, to repair the args
+        that are no longer valid for the new input shape, eg. kernel sizes that no longer fit within the input. Layers
+        whose args do not depend on their input shape do not need to override this method.
+        """
+        pass
+
+    def get_structure(self):
+        """
+        Returns a hashable description of the layer, made up of the layer's name, arguments and I/O shapes. Two layers
+        with equal structures produce identical keras layers.
+        """
+        return (
+            self.get_name(),
+            canonical_value(self.args),
+            canonical_value(self.inputshape.dimensions),
+            canonical_value(self.get_output_shape()),
+        )
+
+    def copy(self):
+        """
+        Returns a copy of the layer that can be mutated independently of this layer. The arg values and shapes are
+        immutable and thus shared.
+        """
+        layer = object.__new__(type(self))
+        layer.args = dict(self.args)
+        layer.inputshape = LayerShape(self.inputshape.dimensions)
+        layer.outputshape = LayerShape(self.outputshape.dimensions)
+        return layer
+
     def mutate(self, verbose=False):
-        if self.mutation_funcs:
-            mutate_eval = "self." + random.choice(self.mutation_funcs)
+        if self._mutation_operators:
+            name, func = choose_mutation_operator(
+                self._mutation_operators, self._mutation_weights
+            )
             if verbose:
-                print("[MUTATE] invoking `{}`".format(mutate_eval))
-            eval(mutate_eval)()
+                print("[MUTATE] invoking `self.{}`".format(name))
+            func(self)
 
     @abstractmethod
     def _gen_args(self, input_shape, args):
@@ -26,6 +26,41 @@ def gen_2d_kernel_size(input_size):
     return (kernel_size, kernel_size)
 
 
+def fits_input(input_shape, window_size, dilation=(1, 1)):
+    """
+    Checks if a, possibly dilated, kernel or pool window fits within the spatial dimensions of an input, as is
+    required to produce a non-empty output when using valid padding.
+    """
+    return all(
+        (size - 1) * rate + 1 <= dim
+        for dim, size, rate in zip(input_shape[:2], window_size, dilation)
+    )
+
+
+def max_window_size(input_shape, padding, max_bound, dilation=(1, 1)):
+    """
+    Returns the largest square kernel or pool size, up to max_bound, that produces a non-empty output for the input
+    shape and padding. With same padding the output is never empty, with valid padding the dilated window must fit
+    within the input.
+    """
+    if padding == ArgPadding.VALID:
+        for dim, rate in zip(input_shape[:2], dilation):
+            max_bound = min(max_bound, (dim - 1) // rate + 1)
+    return max(1, max_bound)
+
+
+def max_dilation_rate(input_shape, padding, kernel_size, max_bound):
+    """
+    Returns the largest dilation rate, up to max_bound, for which the dilated kernel produces a non-empty output for
+    the input shape and padding.
+    """
+    if padding == ArgPadding.VALID:
+        for dim, size in zip(input_shape[:2], kernel_size):
+            if size > 1:
+                max_bound = min(max_bound, (dim - 1) // (size - 1))
+    return max(1, max_bound)
+
+
 def gen_3d_strides(max_bound):
     stride_size = random.randint(1, max_bound)
     return (stride_size, stride_size, stride_size)
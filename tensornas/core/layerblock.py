@@ -1,6 +1,6 @@
 from tensornas.core.block import Block
 
-from tensornas.layers import Layers
+from tensornas.layers import get_layer_class
 
 
 class LayerBlock(Block):
@@ -13,27 +13,56 @@ class LayerBlock(Block):
     tensorflow/keras layer which can then be generated when required.
     """
 
+    __slots__ = ("layer",)
+
     MAX_SUB_BLOCKS = 0
     SUB_BLOCK_TYPES = None
 
     def __init__(self, input_shape, parent_block, layer_type, args=None):
         if not input_shape:
             input_shape = parent_block._get_cur_output_shape()
-        layer = eval("Layers." + layer_type.name + ".value.Layer")
+        layer = get_layer_class(layer_type)
         self.layer = layer(input_shape=input_shape, args=args)
 
         super().__init__(
             input_shape=input_shape, parent_block=parent_block, layer_type=layer_type
         )
 
+    def _copy_node(self):
+        block = super()._copy_node()
+        block.layer = self.layer.copy()
+        return block
+
     def mutate(self, verbose=False):
-        return self.layer.mutate(verbose)
+        ret = self.layer.mutate(verbose)
+        self.propagate_io_shapes()
+        return ret
 
     def get_output_shape(self):
         return self.layer.get_output_shape()
 
-    def get_keras_layers(self, input_tensor):
-        return self.layer.get_keras_layer(input_tensor)
+    def get_keras_layers(self, input_tensor, keras_layers=None):
+        output = self.layer.get_keras_layer(input_tensor)
+        if keras_layers is not None and hasattr(output, "_keras_history"):
+            # The keras layer that produced the output tensor is recorded for weight inheritance
+            keras_layers.append((self, output._keras_history[0]))
+        return output
+
+    def param_count(self):
+        return self.layer.param_count()
+
+    def flops(self):
+        return self.layer.flops()
+
+    def get_validation_errors(self):
+        try:
+            errors = self.layer.get_validation_errors()
+        except Exception as e:
+            errors = [str(e)]
+        return ["{}: {}".format(self.layer.get_name(), error) for error in errors]
+
+    def get_structure(self):
+        return self.layer.get_structure()
 
     def print_self(self):
         self.layer.print()
@@ -44,3 +73,4 @@ class LayerBlock(Block):
     def set_input_shape(self, input_shape):
         self.input_shape = input_shape
         self.layer.inputshape.set(input_shape)
+        self.layer.repair()
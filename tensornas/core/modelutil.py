@@ -1,20 +1,85 @@
-import tensorflow as tf
+def _shortcut_window(input_shape, residual_shape):
+    """
+    Returns the kernel size and strides of the shortcut's projection such that its output's spatial dimensions match
+    those of the residual. The stride is the integer factor by which the residual is smaller than the input, the
+    kernel then covers the remaining difference using valid padding.
+    """
+    strides = tuple(max(1, input_shape[i] // residual_shape[i]) for i in range(2))
+    kernel_size = tuple(
+        input_shape[i] - (residual_shape[i] - 1) * strides[i] for i in range(2)
+    )
+    return kernel_size, strides
+
+
+def shortcut_errors(input_shape, residual_shape):
+    """
+    Statically checks that a shortcut can be created by `shortcut`, returning a list of descriptions of the violated
+    constraints.
+    """
+    if len(input_shape) != 3 or len(residual_shape) != 3:
+        return [
+            "shortcut requires 3D input and residual, got {} and {}".format(
+                input_shape, residual_shape
+            )
+        ]
+    if any(residual_shape[i] > input_shape[i] for i in range(2)):
+        return [
+            "residual {} is larger than shortcut input {}".format(
+                residual_shape, input_shape
+            )
+        ]
+    return []
+
+
+def _has_shortcut_conv(input_shape, residual_shape):
+    kernel_size, strides = _shortcut_window(input_shape, residual_shape)
+    return (
+        kernel_size != (1, 1)
+        or strides != (1, 1)
+        or input_shape[2] != residual_shape[2]
+    )
+
+
+def shortcut_param_count(input_shape, residual_shape):
+    """
+    Returns the parameter count of the shortcut created by `shortcut`, input_shape and residual_shape are given
+    without the batch dimension.
+    """
+    if _has_shortcut_conv(input_shape, residual_shape):
+        kernel_size, _ = _shortcut_window(input_shape, residual_shape)
+        return (
+            kernel_size[0] * kernel_size[1] * input_shape[2] * residual_shape[2]
+            + residual_shape[2]
+        )
+    return 0
+
+
+def shortcut_flops(input_shape, residual_shape):
+    """
+    Returns the floating point operation count of the shortcut created by `shortcut`, including the final addition.
+    """
+    add = residual_shape[0] * residual_shape[1] * residual_shape[2]
+    if _has_shortcut_conv(input_shape, residual_shape):
+        kernel_size, _ = _shortcut_window(input_shape, residual_shape)
+        return 2 * add * kernel_size[0] * kernel_size[1] * input_shape[2] + add
+    return add
 
 
 def shortcut(input, residual):
-    input_shape = tf.keras.backend.int_shape(input)
-    residual_shape = tf.keras.backend.int_shape(residual)
-    stride_width = int(round(input_shape[1] / residual_shape[1]))
-    stride_height = int(round(input_shape[2] / residual_shape[2]))
-    equal_channels = input_shape[3] == residual_shape[3]
+    import tensorflow as tf
+
+    # The shapes are given without the batch dimension
+    input_shape = tf.keras.backend.int_shape(input)[1:]
+    residual_shape = tf.keras.backend.int_shape(residual)[1:]
 
     shortcut = input
 
-    if stride_width > 1 or stride_height > 1 or not equal_channels:
+    if _has_shortcut_conv(input_shape, residual_shape):
+        kernel_size, strides = _shortcut_window(input_shape, residual_shape)
         shortcut = tf.keras.layers.Conv2D(
-            filters=residual_shape[3],
-            kernel_size=(1, 1),
-            strides=(stride_width, stride_height),
+            filters=residual_shape[2],
+            kernel_size=kernel_size,
+            strides=strides,
             padding="valid",
             kernel_initializer="he_normal",
             kernel_regularizer=tf.keras.regularizers.l2(0.0001),
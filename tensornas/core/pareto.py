@@ -0,0 +1,205 @@
+from bisect import bisect_left, bisect_right
+from heapq import heapify, heappop, heappush
+from math import isfinite
+
+
+class ParetoArchive:
+    """
+    An archive of the non-dominated (params, accuracy) fitnesses found during a search, along with the individuals
+    that achieved them, where fewer params and a higher accuracy are better.
+
+    As there are only two objectives, the archived fitnesses are kept sorted by their param count, which means that
+    their accuracies are sorted as well. Whether a fitness is dominated is thus found using a binary search and the
+    fitnesses it dominates are a contiguous run that follows its insertion point, insertion is as such O(log n) apart
+    from shifting the archive's lists.
+
+    If max_size is given the archive is bounded, once full the archived fitness with the smallest crowding distance,
+    ie. the one whose neighbours are closest, is removed after each insertion. The extreme fitnesses are never removed.
+    The crowding distances are kept in a heap, as an insertion or removal only changes the distances of its
+    neighbours the heap is updated in O(log n), outdated heap entries are skipped once they reach the top of the heap.
+    The distances are normalized by the archive's ranges, all distances are thus recomputed in O(n) when one of the
+    extreme fitnesses changes.
+
+    If a reference (params, accuracy) point is given the hypervolume dominated by the archive and bounded by the
+    reference point is maintained incrementally, as each fitness' contribution only depends on the fitness following
+    it.
+
+    The archive can be used in place of DEAP's ParetoFront, eg. as the halloffame of an algorithm, see update.
+    """
+
+    def __init__(self, max_size=None, reference=None):
+        assert max_size is None or max_size >= 2
+        self.max_size = max_size
+        self.reference = reference
+        self.params = []
+        self.accuracies = []
+        self.items = []
+        self.hypervolume = 0.0 if reference is not None else None
+        # Crowding distances of the inner fitnesses by params, along with a heap of (distance, params) entries that
+        # may be outdated, and the ranges by which the distances were normalized
+        self._distances = {}
+        self._heap = []
+        self._ranges = None
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def get_fitnesses(self):
+        """
+        @return List of the archived (params, accuracy) fitnesses, sorted by params
+        """
+        return list(zip(self.params, self.accuracies))
+
+    def is_dominated(self, fitness):
+        """
+        @return True if an archived fitness is at least as good as the fitness in both objectives
+        """
+        params, accuracy = fitness[0], fitness[1]
+        index = bisect_right(self.params, params) - 1
+        return index >= 0 and self.accuracies[index] >= accuracy
+
+    def _contribution(self, index):
+        """
+        The hypervolume exclusively dominated by the archived fitness at index, ie. the rectangle spanning from its
+        params to the following fitness' params, or the reference, and from its accuracy down to the reference.
+        """
+        ref_params, ref_accuracy = self.reference
+        if index + 1 < len(self.params):
+            next_params = min(self.params[index + 1], ref_params)
+        else:
+            next_params = ref_params
+        width = next_params - self.params[index]
+        height = self.accuracies[index] - ref_accuracy
+        if width <= 0 or height <= 0:
+            return 0.0
+        return width * height
+
+    def _get_ranges(self):
+        return (
+            (self.params[-1] - self.params[0]) or 1.0,
+            (self.accuracies[-1] - self.accuracies[0]) or 1.0,
+        )
+
+    def _get_distance(self, index, ranges):
+        params_range, accuracy_range = ranges
+        return (self.params[index + 1] - self.params[index - 1]) / params_range + (
+            self.accuracies[index + 1] - self.accuracies[index - 1]
+        ) / accuracy_range
+
+    def _update_distances(self, indices):
+        """
+        Updates the crowding distances of the fitnesses at the indices, whose neighbours changed.
+        """
+        if self.max_size is None:
+            return
+        inner = range(1, len(self.params) - 1)
+        ranges = self._get_ranges() if self.params else None
+        if ranges != self._ranges or len(self._heap) > 2 * len(self.params) + 16:
+            self._ranges = ranges
+            self._distances = {
+                self.params[i]: self._get_distance(i, ranges) for i in inner
+            }
+            self._heap = [(d, params) for params, d in self._distances.items()]
+            heapify(self._heap)
+            return
+        for i in indices:
+            if i in inner:
+                distance = self._get_distance(i, ranges)
+                self._distances[self.params[i]] = distance
+                heappush(self._heap, (distance, self.params[i]))
+
+    def _remove(self, start, stop):
+        if self.max_size is not None:
+            for params in self.params[start:stop]:
+                self._distances.pop(params, None)
+        if self.reference is not None:
+            self.hypervolume -= sum(self._contribution(i) for i in range(start, stop))
+            if start:
+                self.hypervolume -= self._contribution(start - 1)
+        del self.params[start:stop]
+        del self.accuracies[start:stop]
+        del self.items[start:stop]
+        if self.reference is not None and start:
+            self.hypervolume += self._contribution(start - 1)
+        self._update_distances((start - 1, start))
+
+    def _get_crowded_index(self):
+        """
+        @return Index of the inner fitness with the smallest crowding distance, ties are broken by the fewer params
+        """
+        while True:
+            distance, params = self._heap[0]
+            # Archived params are unique as fitnesses with equal params dominate each other
+            index = bisect_left(self.params, params)
+            if (
+                0 < index < len(self.params) - 1
+                and self.params[index] == params
+                and self._distances.get(params) == distance
+            ):
+                return index
+            heappop(self._heap)
+
+    def insert(self, item, fitness=None):
+        """
+        Archives an item if its fitness is not dominated, removing the archived fitnesses it dominates.
+
+        @param fitness The (params, accuracy) fitness, by default the item's fitness values, ie. a DEAP individual.
+        Fitnesses that are not finite, eg. the penalty fitness of invalid architectures, are never archived.
+        @return True if the item was archived
+        """
+        if fitness is None:
+            fitness = item.fitness.values
+        params, accuracy = float(fitness[0]), float(fitness[1])
+        if not (isfinite(params) and isfinite(accuracy)):
+            return False
+        if self.is_dominated((params, accuracy)):
+            return False
+
+        # The dominated fitnesses have at least as many params and at most the same accuracy
+        start = bisect_left(self.params, params)
+        stop = start
+        while stop < len(self.accuracies) and self.accuracies[stop] <= accuracy:
+            stop += 1
+        self._remove(start, stop)
+
+        if self.reference is not None and start:
+            self.hypervolume -= self._contribution(start - 1)
+        self.params.insert(start, params)
+        self.accuracies.insert(start, accuracy)
+        self.items.insert(start, item)
+        if self.reference is not None:
+            self.hypervolume += self._contribution(start)
+            if start:
+                self.hypervolume += self._contribution(start - 1)
+        self._update_distances((start - 1, start, start + 1))
+
+        if self.max_size is not None and len(self.items) > self.max_size:
+            index = self._get_crowded_index()
+            self._remove(index, index + 1)
+            return index != start
+        return True
+
+    def update(self, population):
+        """
+        Archives the individuals of a population, as with DEAP's HallOfFame.update. The individuals are cloned when
+        archived, see Individual.clone.
+        """
+        for ind in population:
+            if not self.is_dominated(ind.fitness.values):
+                self.insert(ind.clone() if hasattr(ind, "clone") else ind)
+
+    def clear(self):
+        self.params = []
+        self.accuracies = []
+        self.items = []
+        self._distances = {}
+        self._heap = []
+        self._ranges = None
+        if self.reference is not None:
+            self.hypervolume = 0.0
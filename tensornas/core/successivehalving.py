@@ -0,0 +1,66 @@
+class SuccessiveHalving:
+    """
+    Multi-fidelity evaluation of a generation of individuals using successive halving.
+
+    All individuals are first trained using a small budget, ie. few training steps on a subset of the training data.
+    Only the best 1/eta of the individuals, ranked by accuracy, are promoted to the next rung where the budget is
+    multiplied by eta. This is repeated until the remaining individuals are trained using the full budget, max_steps
+    on the entire training set. Poor architectures are thus discarded after a fraction of the full training cost.
+
+    The fitness returned for an individual is the fitness achieved in the highest rung it reached, the rung's index
+    is stored in the individual's fidelity attribute such that fitnesses of differing fidelities can be told apart.
+
+    evaluate must be a callable that takes a list of individuals along with the keyword arguments steps and
+    train_size and returns the list of their fitnesses, eg. EvaluationPool.evaluate_individuals. The evaluate method
+    is registered as a DEAP toolbox's evaluate_population function, see ea_nsga2.
+    """
+
+    def __init__(self, evaluate, min_steps, max_steps, eta=3, min_train_size=None):
+        assert eta > 1
+        assert 0 < min_steps <= max_steps
+        self.evaluate_func = evaluate
+        self.min_steps = min_steps
+        self.max_steps = max_steps
+        self.eta = eta
+        self.min_train_size = min_train_size
+
+    def get_rungs(self):
+        """
+        @return List of (steps, train_size) budgets, a train_size of None meaning the entire training set
+        """
+        rungs = []
+        steps = self.min_steps
+        train_size = self.min_train_size
+        while steps < self.max_steps:
+            rungs.append((steps, train_size))
+            steps *= self.eta
+            if train_size is not None:
+                train_size *= self.eta
+        rungs.append((self.max_steps, None))
+        return rungs
+
+    @staticmethod
+    def _rank_key(fitness):
+        # Higher accuracy first, ties broken by the lower parameter count
+        return fitness[1], -fitness[0]
+
+    def evaluate(self, individuals):
+        fitnesses = [None] * len(individuals)
+        survivors = list(range(len(individuals)))
+        rungs = self.get_rungs()
+
+        for rung, (steps, train_size) in enumerate(rungs):
+            results = self.evaluate_func(
+                [individuals[i] for i in survivors], steps=steps, train_size=train_size
+            )
+            for i, fitness in zip(survivors, results):
+                fitnesses[i] = tuple(fitness)
+                individuals[i].fidelity = rung
+
+            if rung == len(rungs) - 1:
+                break
+
+            survivors.sort(key=lambda i: self._rank_key(fitnesses[i]), reverse=True)
+            survivors = survivors[: max(1, len(survivors) // self.eta)]
+
+        return fitnesses
@@ -0,0 +1,225 @@
+"""
+Surrogate-assisted evaluation, a predictor learns the accuracy of block architectures from the architectures evaluated
+during a search and is used to only train the most promising candidates, see SurrogateFilter.
+"""
+import math
+from collections import Counter
+from enum import Enum
+from numbers import Real
+
+import numpy as np
+
+
+def _walk(block, depth=0):
+    yield block, depth
+    for sb in block.input_blocks + block.middle_blocks + block.output_blocks:
+        yield from _walk(sb, depth + 1)
+
+
+def _log_size(shape):
+    size = 1
+    for dim in shape or ():
+        if isinstance(dim, int) and dim > 0:
+            size *= dim
+    return math.log1p(size)
+
+
+def featurize(block_architecture):
+    """
+    Describes a block architecture as a set of named numeric features: the histogram of its layer types, the layers'
+    args, where numeric args are summed on a log scale and the remaining args are counted per value, its depth, the
+    sizes of its layers' outputs and its analytic param and FLOP counts.
+
+    @return Dict mapping feature names to values
+    """
+    from tensornas.core.layerblock import LayerBlock
+
+    features = Counter()
+    for block, depth in _walk(block_architecture):
+        features["depth"] = max(features["depth"], depth)
+        if not isinstance(block, LayerBlock):
+            features["blocks"] += 1
+            continue
+
+        name = block.layer.get_name()
+        features["layers"] += 1
+        features["layer:" + name] += 1
+        features["log_activations"] += _log_size(block.output_shape)
+        for arg, value in block.layer.args.items():
+            key = "arg:{}:{}".format(name, getattr(arg, "name", arg))
+            if isinstance(value, Real) and not isinstance(value, bool):
+                features[key] += math.log1p(abs(value))
+            elif isinstance(value, (tuple, list)) and all(
+                isinstance(v, Real) for v in value
+            ):
+                features[key] += sum(math.log1p(abs(v)) for v in value)
+            else:
+                value = value.name if isinstance(value, Enum) else value
+                features["{}={}".format(key, value)] += 1
+
+    features["log_input_size"] = _log_size(block_architecture.input_shape)
+    features["log_output_size"] = _log_size(block_architecture.output_shape)
+    # The analytic counts fail for architectures with invalid layer shapes
+    try:
+        features["log_params"] = math.log1p(block_architecture.param_count())
+        features["log_flops"] = math.log1p(block_architecture.flops())
+    except Exception:
+        pass
+    return dict(features)
+
+
+class SurrogatePredictor:
+    """
+    Predicts the accuracy of block architectures using ridge regression on their standardized features, see featurize.
+    The predictor is trained online, evaluated architectures are added one at a time and the model is re-fitted on all
+    added samples when fit is called. The feature set grows as new layer types and arg values are encountered.
+    """
+
+    def __init__(self, regularization=1.0):
+        self.regularization = regularization
+        self.samples = []
+        self.targets = []
+        self.columns = None
+        self.mean = None
+        self.scale = None
+        self.weights = None
+        self.intercept = None
+
+    def __len__(self):
+        return len(self.samples)
+
+    def is_fitted(self):
+        return self.weights is not None
+
+    def add(self, block_architecture, accuracy):
+        self.samples.append(featurize(block_architecture))
+        self.targets.append(float(accuracy))
+
+    def _get_matrix(self, samples):
+        x = np.zeros((len(samples), len(self.columns)))
+        for row, features in enumerate(samples):
+            for name, value in features.items():
+                column = self.columns.get(name)
+                if column is not None:
+                    x[row, column] = value
+        return x
+
+    def fit(self):
+        """
+        Fits the model to all added samples.
+        """
+        names = sorted(set().union(*self.samples))
+        self.columns = {name: column for column, name in enumerate(names)}
+        x = self._get_matrix(self.samples)
+        y = np.array(self.targets)
+
+        self.mean = x.mean(axis=0)
+        self.scale = x.std(axis=0)
+        # Features that do not vary between the samples carry no information
+        self.scale[self.scale == 0] = 1.0
+        z = (x - self.mean) / self.scale
+
+        self.intercept = y.mean()
+        self.weights = np.linalg.solve(
+            z.T @ z + self.regularization * np.eye(len(names)),
+            z.T @ (y - self.intercept),
+        )
+
+    def predict(self, block_architectures):
+        """
+        @return Array of the predicted accuracies
+        """
+        assert self.is_fitted()
+        x = self._get_matrix([featurize(ba) for ba in block_architectures])
+        return (x - self.mean) / self.scale @ self.weights + self.intercept
+
+
+class SurrogateFilter:
+    """
+    Surrogate-assisted evaluation of a generation of individuals. Once the predictor is trained, the candidates are
+    ranked by their analytic param counts and predicted accuracies, as in NSGA-II, and only the best fraction of them
+    is evaluated, ie. trained. The remaining candidates are not evaluated, None is returned instead of their fitness
+    and their fitness is left invalid by ea_simple and ea_nsga2, which discard them. Rejected candidates are as such
+    never recorded as measured, eg. in the hall of fame or a checkpoint.
+
+    Every evaluated architecture is added to the predictor, which is re-fitted after every refit_interval new samples.
+    Until min_samples architectures were evaluated all candidates are evaluated.
+
+    evaluate must be a callable that takes a list of individuals and returns the list of their fitnesses, eg.
+    EvaluationPool.evaluate_individuals, the fitnesses should be full-fidelity as the predictor is trained on them.
+    As with SuccessiveHalving, the evaluate method is registered as a DEAP toolbox's evaluate_population function.
+    """
+
+    def __init__(
+        self,
+        evaluate,
+        fraction=0.25,
+        min_samples=20,
+        refit_interval=10,
+        predictor=None,
+        verbose=False,
+    ):
+        assert 0 < fraction <= 1
+        self.evaluate_func = evaluate
+        self.fraction = fraction
+        self.min_samples = min_samples
+        self.refit_interval = refit_interval
+        self.predictor = predictor or SurrogatePredictor()
+        self.verbose = verbose
+        self.new_samples = 0
+        self.evaluated_count = 0
+        self.rejected_count = 0
+
+    def _select_candidates(self, individuals):
+        """
+        @return Indices of the individuals to be evaluated
+        """
+        from tensornas.core.algorithms import _get_ranks_and_distances
+
+        if not self.predictor.is_fitted():
+            return list(range(len(individuals)))
+
+        architectures = [ind.block_architecture for ind in individuals]
+        accuracies = self.predictor.predict(architectures)
+        params = []
+        for ba in architectures:
+            try:
+                params.append(ba.param_count())
+            except Exception:
+                params.append(np.inf)
+
+        ranks, distances = _get_ranks_and_distances(
+            np.column_stack((-np.array(params, dtype=float), accuracies))
+        )
+        count = max(1, math.ceil(self.fraction * len(individuals)))
+        return sorted(np.lexsort((-distances, ranks))[:count])
+
+    def evaluate(self, individuals):
+        if not individuals:
+            return []
+
+        selected = self._select_candidates(individuals)
+        results = self.evaluate_func([individuals[i] for i in selected])
+
+        fitnesses = [None] * len(individuals)
+        for i, fitness in zip(selected, results):
+            fitnesses[i] = tuple(fitness)
+            if np.isfinite(fitness[0]):
+                self.predictor.add(individuals[i].block_architecture, fitness[1])
+                self.new_samples += 1
+
+        self.evaluated_count += len(selected)
+        self.rejected_count += len(individuals) - len(selected)
+        if len(self.predictor) >= self.min_samples and (
+            not self.predictor.is_fitted() or self.new_samples >= self.refit_interval
+        ):
+            self.predictor.fit()
+            self.new_samples = 0
+            if self.verbose:
+                print(
+                    "[SURROGATE] fitted on {} samples, {} rejected".format(
+                        len(self.predictor), self.rejected_count
+                    )
+                )
+
+        return fitnesses
@@ -1,5 +1,6 @@
 import math
 import random
+import re
 from enum import Enum, auto
 from functools import reduce
 from pkgutil import iter_modules
@@ -41,6 +42,62 @@ def _generate_permutations(product, item_count):
     return prime_factors
 
 
+def canonical_value(value):
+    """
+    Converts a layer argument, shape or block type into a hashable value that does not depend on object identity,
+    eg. enum members are replaced by their names and lists by tuples.
+    """
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (tuple, list)):
+        return tuple(canonical_value(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(
+            sorted((canonical_value(k), canonical_value(v)) for k, v in value.items())
+        )
+    return value
+
+
+def shape_tuple(shape):
+    """
+    Returns a shape as a tuple, scalar shapes, eg. the channel count output by a global pooling layer, are returned
+    as a single dimension tuple.
+    """
+    if isinstance(shape, (tuple, list)):
+        return tuple(shape)
+    return (shape,)
+
+
+def get_mutation_operators(cls, pattern=r"^_mutate"):
+    """
+    Builds the mutation operator table of a class, ie. the methods whose names match pattern.
+
+    @return Tuple of the (name, function) operators and their weights, taken from the class's MUTATION_WEIGHTS dict
+    where operators without a weight have a weight of 1. The weights are None if no weights are specified, meaning
+    that operators are selected uniformly.
+    """
+    operators = tuple(
+        (name, getattr(cls, name))
+        for name in dir(cls)
+        if re.search(pattern, name) and callable(getattr(cls, name))
+    )
+    weights = getattr(cls, "MUTATION_WEIGHTS", None)
+    if weights:
+        weights = tuple(weights.get(name, 1) for name, _ in operators)
+    else:
+        weights = None
+    return operators, weights
+
+
+def choose_mutation_operator(operators, weights=None):
+    """
+    @return A (name, function) operator randomly selected from an operator table using the operator weights
+    """
+    if weights is None:
+        return random.choice(operators)
+    return random.choices(operators, weights=weights)[0]
+
+
 def mutate_dimension(intput_dim):
     while True:
         new_dim = _generate_permutations(dimension_mag(intput_dim), len(intput_dim))
@@ -158,6 +215,27 @@ def find_modules(pkg, dir):
     return modules
 
 
+def find_module_names(pkg, dir):
+    """
+    Returns the full names of the modules within a package and, recursively, its sub-packages. Unlike find_modules,
+    the modules are not imported, allowing for plugins to be registered without importing them.
+    """
+    import os
+
+    modules = []
+    packages = []
+    for mod in iter_modules([dir]):
+        if mod.ispkg:
+            packages.append(mod.name)
+        else:
+            modules.append(pkg + "." + mod.name)
+
+    for name in sorted(packages):
+        modules.extend(find_module_names(pkg + "." + name, os.path.join(dir, name)))
+
+    return modules
+
+
 def custom_sparse_categorical_accuracy(y_true, y_pred):
     from tensorflow.keras import backend as K
 
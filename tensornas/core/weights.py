@@ -0,0 +1,146 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+
+class WeightStore:
+    """
+    A weight store persists the trained weights of each layer block, allowing for the layers of a child architecture
+    that are unchanged from its parent's to be warm-started with the parent's trained weights (Lamarckian
+    inheritance).
+
+    Weights are keyed by the ID of the architecture that trained them, the layer block's block_id, which is kept when
+    an architecture is copied for mutation or crossover, and the layer's structure, ie. its args and I/O shapes. A
+    layer that was mutated or whose input shape changed thus has a different key and is trained from scratch. An
+    architecture inherits the weights trained by itself or its closest ancestor, see BlockArchitecture.get_lineage,
+    as such siblings that share a layer block do not overwrite each other's weights.
+
+    The store holds at most max_entries layers' weights, the least recently used weights are evicted first.
+
+    If a directory is given the weights are stored as .npz files within it, allowing the store to be shared between
+    evaluation worker processes, otherwise the weights are kept in memory. A store is used by the workers of an
+    EvaluationPool by passing it as the pool's weight_store argument, the store is then copied to each worker. Only
+    stores with a directory share the weights between workers, each worker's copy of an in-memory store only holds
+    the weights trained by that worker.
+    """
+
+    def __init__(self, directory=None, max_entries=1000):
+        """
+        @param max_entries The maximum number of layers whose weights are stored, None for no limit
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.weights = OrderedDict()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(layer_block, architecture_id):
+        structure_hash = hashlib.sha1(
+            repr(layer_block.get_structure()).encode()
+        ).hexdigest()
+        return "{}-{}-{}".format(architecture_id, layer_block.block_id, structure_hash)
+
+    def _get_filename(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def _get(self, key):
+        if key in self.weights:
+            self.weights.move_to_end(key)
+            return self.weights[key]
+        if self.directory:
+            filename = self._get_filename(key)
+            try:
+                with np.load(filename) as data:
+                    weights = [data["arr_{}".format(i)] for i in range(len(data.files))]
+                # The modification time orders the files by their last use, see _evict
+                os.utime(filename)
+                return weights
+            except FileNotFoundError:
+                pass
+        return None
+
+    def get(self, layer_block, lineage):
+        """
+        @param lineage The lineage of the layer block's architecture, see BlockArchitecture.get_lineage
+        @return List of the layer's weight arrays trained by the closest architecture of the lineage or None if no
+        weights are stored for the layer
+        """
+        for architecture_id in lineage:
+            weights = self._get(self.get_key(layer_block, architecture_id))
+            if weights is not None:
+                return weights
+        return None
+
+    def put(self, layer_block, architecture_id, weights):
+        key = self.get_key(layer_block, architecture_id)
+        if self.directory:
+            # Written to a temporary file first such that concurrent readers never see a partially written file
+            fd, tmp_filename = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, *weights)
+            os.replace(tmp_filename, self._get_filename(key))
+        else:
+            self.weights[key] = weights
+            self.weights.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        if self.max_entries is None:
+            return
+        while len(self.weights) > self.max_entries:
+            self.weights.popitem(last=False)
+        if self.directory:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".npz"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        pass
+            if len(entries) > self.max_entries:
+                entries.sort()
+                for _, filename in entries[: len(entries) - self.max_entries]:
+                    # The file might have already been evicted by another process
+                    try:
+                        os.remove(filename)
+                    except FileNotFoundError:
+                        pass
+
+    def inherit(self, keras_layers, lineage):
+        """
+        Sets the weights of each keras layer whose layer block has stored weights of matching shapes.
+
+        @param keras_layers List of (LayerBlock, keras layer) tuples
+        @param lineage The lineage of the architecture, see BlockArchitecture.get_lineage
+        @return Number of keras layers that inherited weights
+        """
+        count = 0
+        for layer_block, keras_layer in keras_layers:
+            current = keras_layer.get_weights()
+            if not current:
+                continue
+            weights = self.get(layer_block, lineage)
+            if weights is None or [w.shape for w in weights] != [
+                w.shape for w in current
+            ]:
+                continue
+            keras_layer.set_weights(weights)
+            count += 1
+        return count
+
+    def store(self, keras_layers, lineage):
+        """
+        Stores the weights of each keras layer that has weights, keyed by the ID of the architecture that trained
+        them.
+
+        @param keras_layers List of (LayerBlock, keras layer) tuples
+        @param lineage The lineage of the architecture, see BlockArchitecture.get_lineage
+        """
+        for layer_block, keras_layer in keras_layers:
+            weights = keras_layer.get_weights()
+            if weights:
+                self.put(layer_block, lineage[0], weights)
@@ -0,0 +1,95 @@
+"""
+Zero-cost proxies score an untrained keras model using one mini-batch of data, no training is performed. The scores
+correlate with the accuracy the model achieves after training and can thus be used to cheaply pre-screen
+architectures. Each proxy takes the model, a batch of data, the batch's labels and the loss, and returns a score where
+higher is better.
+"""
+import numpy as np
+import tensorflow as tf
+
+
+def get_logits_model(model, dtype=None):
+    """
+    Copies a model such that its final layer has a linear activation, ie. the copy outputs the logits. The proxies
+    that differentiate the sum of the model's outputs require the logits, as the outputs of a softmax always sum to
+    one and their sum's gradient is thus zero.
+
+    @param dtype Optional dtype of the copy's layers, eg. float64
+    @return The copy, holding a copy of the model's weights
+    """
+    last = model.layers[-1]
+
+    def clone_layer(layer):
+        config = layer.get_config()
+        if layer is last and "activation" in config:
+            config["activation"] = "linear"
+        if dtype is not None:
+            config["dtype"] = dtype
+        return layer.__class__.from_config(config)
+
+    logits_model = tf.keras.models.clone_model(model, clone_function=clone_layer)
+    logits_model.set_weights(
+        [w.astype(dtype) if dtype else w for w in model.get_weights()]
+    )
+    return logits_model
+
+
+def synflow(model, data, labels, loss):
+    """
+    SynFlow, the sum over all parameters of |parameter * gradient| of the logits' sum, computed using an input of
+    ones with all weights replaced by their absolute values. The score is computed using a float64 copy of the model,
+    as the products over the layers of deep models underflow in float32. The model itself is not modified.
+
+    Models whose outputs overflow even in float64, eg. due to stacked exponential activations, have no meaningful
+    score and are scored -inf.
+    """
+    logits_model = get_logits_model(model, dtype="float64")
+    for w in logits_model.trainable_weights:
+        w.assign(tf.abs(w))
+
+    x = tf.ones((1,) + tuple(data.shape[1:]), dtype=tf.float64)
+    with tf.GradientTape() as tape:
+        output = tf.reduce_sum(logits_model(x, training=False))
+    grads = tape.gradient(output, logits_model.trainable_weights)
+
+    score = 0.0
+    for w, g in zip(logits_model.trainable_weights, grads):
+        if g is not None:
+            score += float(tf.reduce_sum(tf.abs(w * g)))
+    return score if np.isfinite(score) else -np.inf
+
+
+def jacob_cov(model, data, labels, loss):
+    """
+    NASWOT Jacobian covariance, scores how uncorrelated the input Jacobians of the logits of the samples in the batch
+    are, ie. how well the untrained model can tell the samples apart. Requires a batch of at least two samples.
+    """
+    if len(data) < 2:
+        raise ValueError("jacob_cov requires a batch of at least 2 samples")
+
+    logits_model = get_logits_model(model)
+    x = tf.convert_to_tensor(data, dtype=tf.float32)
+    with tf.GradientTape() as tape:
+        tape.watch(x)
+        output = tf.reduce_sum(logits_model(x, training=False))
+    jacobians = tape.gradient(output, x).numpy().reshape(len(data), -1)
+
+    correlations = np.nan_to_num(np.corrcoef(jacobians))
+    eigenvalues = np.linalg.eigvalsh(correlations)
+    k = 1e-5
+    return float(-np.sum(np.log(np.abs(eigenvalues) + k) + 1.0 / (np.abs(eigenvalues) + k)))
+
+
+def grad_norm(model, data, labels, loss):
+    """
+    The sum of the euclidean norms of the loss's gradients with respect to each trainable weight.
+    """
+    loss_func = tf.keras.losses.get(loss)
+    x = tf.convert_to_tensor(data, dtype=tf.float32)
+    with tf.GradientTape() as tape:
+        value = tf.reduce_mean(loss_func(labels, model(x, training=True)))
+    grads = tape.gradient(value, model.trainable_weights)
+    return float(sum(tf.norm(g) for g in grads if g is not None))
+
+
+PROXIES = {"synflow": synflow, "jacob_cov": jacob_cov, "grad_norm": grad_norm}
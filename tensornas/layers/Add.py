@@ -1,7 +1,5 @@
 from enum import Enum, auto
 
-import tensorflow as tf
-
 from tensornas.core.layer import NetworkLayer
 
 
@@ -10,6 +8,8 @@ class Args(Enum):
 
 
 class Layer(NetworkLayer):
+    __slots__ = ()
+
     def _gen_args(cls, input_shape, args):
         assert args
         return {cls.get_args_enum().LAYERS: args}
@@ -18,6 +18,8 @@ class Layer(NetworkLayer):
         return self.inputshape.get()
 
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.Add(self.args.get(self.get_args_enum().LAYERS))(
             input_tensor
         )
@@ -1,7 +1,5 @@
 from enum import Enum, auto
 
-import tensorflow as tf
-
 from tensornas.core.layer import NetworkLayer
 
 
@@ -11,6 +9,8 @@ class Args(Enum):
 
 
 class Layer(NetworkLayer):
+    __slots__ = ()
+
     def _gen_args(self, input_shape, args):
         axis = -1
         layers = None
@@ -39,6 +39,8 @@ class Layer(NetworkLayer):
         return dim
 
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         # TODO
         keras_layers = [
             layer.get_keras_layer()
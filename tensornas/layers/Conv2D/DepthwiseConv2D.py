@@ -1,5 +1,3 @@
-import tensorflow as tf
-
 from tensornas.layers.Conv2D import Layer
 
 """The number of depthwise convolution output channels for each input channel. The total number of depthwise convolution 
@@ -16,7 +14,24 @@ Given a 4D input tensor ('NHWC' or 'NCHW' data formats) and a filter
 
 
 class Layer(Layer):
+    __slots__ = ()
+
+    def get_output_shape(self):
+        # A depthwise convolution keeps the input's channel count, the filter count is not used
+        out = super().get_output_shape()
+        return out[0], out[1], self._get_input_channels()
+
+    def param_count(self):
+        in_channels = self._get_input_channels()
+        return self._get_kernel_mag() * in_channels + in_channels
+
+    def flops(self):
+        out = self.get_output_shape()
+        return 2 * out[0] * out[1] * self._get_input_channels() * self._get_kernel_mag()
+
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.DepthwiseConv2D(
             kernel_size=self.args.get(self.get_args_enum().KERNEL_SIZE),
             strides=self.args.get(self.get_args_enum().STRIDES),
@@ -1,10 +1,12 @@
-import tensorflow as tf
-
 from tensornas.layers.Conv2D import Layer
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.Conv2D(
             filters=self.args.get(self.get_args_enum().FILTERS),
             kernel_size=self.args.get(self.get_args_enum().KERNEL_SIZE),
@@ -1,6 +1,5 @@
 import random
 from math import ceil
-import tensorflow as tf
 
 from tensornas.layers.Conv2D import Layer
 import tensornas.core.layerargs as la
@@ -8,6 +7,8 @@ from tensornas.core.util import MutationOperators
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     def _gen_args(self, input_shape, args):
         return {
             self.get_args_enum().FILTERS: random.randint(1, self.MAX_FILTER_COUNT),
@@ -27,6 +28,8 @@ class Layer(Layer):
         return
 
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.Conv2D(
             filters=self.args.get(self.get_args_enum().FILTERS),
             kernel_size=self.args.get(self.get_args_enum().KERNEL_SIZE),
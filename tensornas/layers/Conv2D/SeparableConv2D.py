@@ -1,10 +1,24 @@
-import tensorflow as tf
-
 from tensornas.layers.Conv2D import Layer
 
 
 class Layer(Layer):
+    __slots__ = ()
+
+    def param_count(self):
+        in_channels = self._get_input_channels()
+        filters = self.args[self.get_args_enum().FILTERS]
+        return self._get_kernel_mag() * in_channels + in_channels * filters + filters
+
+    def flops(self):
+        out = self.get_output_shape()
+        in_channels = self._get_input_channels()
+        depthwise = self._get_kernel_mag() * in_channels
+        pointwise = in_channels * out[2]
+        return 2 * out[0] * out[1] * (depthwise + pointwise)
+
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.SeparableConv2D(
             filters=self.args.get(self.get_args_enum().FILTERS),
             kernel_size=self.args.get(self.get_args_enum().KERNEL_SIZE),
@@ -3,7 +3,13 @@ from enum import Enum, auto
 
 import tensornas.core.layerargs as la
 from tensornas.core.layer import NetworkLayer
-from tensornas.core.util import mutate_int, mutate_enum, mutate_tuple, MutationOperators
+from tensornas.core.util import (
+    mutate_int,
+    mutate_enum,
+    mutate_tuple,
+    MutationOperators,
+    shape_tuple,
+)
 
 
 class Args(Enum):
@@ -18,6 +24,8 @@ class Args(Enum):
 
 
 class Layer(NetworkLayer):
+    __slots__ = ()
+
     MAX_FILTER_COUNT = 128
     MAX_KERNEL_DIMENSION = 7
     MAX_STRIDE = 7
@@ -25,8 +33,9 @@ class Layer(NetworkLayer):
 
     def _gen_args(self, input_shape, args):
         filter_count = random.randint(1, self.MAX_FILTER_COUNT)
-        kernel_size = la.gen_2d_kernel_size(self.MAX_KERNEL_DIMENSION)
+        kernel_size = None
         padding = la.gen_padding()
+        dilation_rate = la.gen_2d_dilation()
 
         if args:
             if self.get_args_enum().FILTERS in args:
@@ -36,15 +45,56 @@ class Layer(NetworkLayer):
             if self.get_args_enum().PADDING in args:
                 padding = args.get(self.get_args_enum().PADDING)
 
+        if kernel_size is None:
+            # Only kernel sizes that produce a non-empty output for the input shape and padding are sampled
+            kernel_size = la.gen_2d_kernel_size(
+                la.max_window_size(
+                    input_shape, padding, self.MAX_KERNEL_DIMENSION - 1, dilation_rate
+                )
+                + 1
+            )
+        # Kernel sizes passed in args, eg. by a block template, might not fit within the input
+        padding, dilation_rate = self._fit_input(
+            input_shape, kernel_size, padding, dilation_rate
+        )
+
         return {
             self.get_args_enum().FILTERS: filter_count,
             self.get_args_enum().KERNEL_SIZE: kernel_size,
             self.get_args_enum().STRIDES: (1, 1),
             self.get_args_enum().PADDING: padding,
-            self.get_args_enum().DILATION_RATE: la.gen_2d_dilation(),
+            self.get_args_enum().DILATION_RATE: dilation_rate,
             self.get_args_enum().ACTIVATION: la.gen_activation(),
         }
 
+    @staticmethod
+    def _fit_input(input_shape, kernel_size, padding, dilation_rate):
+        """
+        Reduces the dilation rate such that the dilated kernel fits within the input, if the kernel does not fit even
+        when undilated then same padding is used instead of valid padding, as such the output is never empty.
+
+        @return Tuple of the padding and dilation rate
+        """
+        max_dilation = la.max_dilation_rate(
+            input_shape, padding, kernel_size, max(dilation_rate)
+        )
+        dilation_rate = tuple(min(rate, max_dilation) for rate in dilation_rate)
+        if padding == la.ArgPadding.VALID and not la.fits_input(
+            input_shape, kernel_size, dilation_rate
+        ):
+            padding = la.ArgPadding.SAME
+        return padding, dilation_rate
+
+    def repair(self):
+        padding, dilation_rate = self._fit_input(
+            self.inputshape.get(),
+            self.args[self.get_args_enum().KERNEL_SIZE],
+            self.args[self.get_args_enum().PADDING],
+            self.args[self.get_args_enum().DILATION_RATE],
+        )
+        self.args[self.get_args_enum().PADDING] = padding
+        self.args[self.get_args_enum().DILATION_RATE] = dilation_rate
+
     def _mutate_filters(self, operator=MutationOperators.STEP):
         self.args[self.get_args_enum().FILTERS] = mutate_int(
             self.args[self.get_args_enum().FILTERS],
@@ -54,14 +104,25 @@ class Layer(NetworkLayer):
         )
 
     def _mutate_kernel_size(self, operator=MutationOperators.SYNC_STEP):
-        self.args[self.get_args_enum().KERNEL_SIZE] = mutate_tuple(
-            self.args[self.get_args_enum().KERNEL_SIZE],
-            1,
+        # The kernel size, padding and dilation rate are constrained such that the output is not empty
+        max_kernel = la.max_window_size(
+            self.inputshape.get(),
+            self.args[self.get_args_enum().PADDING],
             self.MAX_KERNEL_DIMENSION,
-            operator,
+            self.args[self.get_args_enum().DILATION_RATE],
         )
+        if max_kernel > 1:
+            self.args[self.get_args_enum().KERNEL_SIZE] = mutate_tuple(
+                self.args[self.get_args_enum().KERNEL_SIZE],
+                1,
+                max_kernel,
+                operator,
+            )
 
     def _mutate_strides(self, operator=MutationOperators.SYNC_STEP):
+        # Keras does not support strides and dilation rates that are both larger than one
+        if not self._single_dilation_rate():
+            return
         self.args[self.get_args_enum().STRIDES] = mutate_tuple(
             self.args[self.get_args_enum().STRIDES],
             1,
@@ -70,17 +131,31 @@ class Layer(NetworkLayer):
         )
 
     def _mutate_padding(self):
-        self.args[self.get_args_enum().PADDING] = mutate_enum(
-            self.args[self.get_args_enum().PADDING], la.ArgPadding
-        )
+        padding = mutate_enum(self.args[self.get_args_enum().PADDING], la.ArgPadding)
+        if padding == la.ArgPadding.VALID and not la.fits_input(
+            self.inputshape.get(),
+            self.args[self.get_args_enum().KERNEL_SIZE],
+            self.args[self.get_args_enum().DILATION_RATE],
+        ):
+            return
+        self.args[self.get_args_enum().PADDING] = padding
 
     def _mutate_dilation_rate(self, operator=MutationOperators.SYNC_STEP):
-        self.args[self.get_args_enum().DILATION_RATE] = mutate_tuple(
-            self.args[self.get_args_enum().DILATION_RATE],
-            1,
+        if not self._single_stride():
+            return
+        max_dilation = la.max_dilation_rate(
+            self.inputshape.get(),
+            self.args[self.get_args_enum().PADDING],
+            self.args[self.get_args_enum().KERNEL_SIZE],
             self.MAX_DILATION,
-            operator,
         )
+        if max_dilation > 1:
+            self.args[self.get_args_enum().DILATION_RATE] = mutate_tuple(
+                self.args[self.get_args_enum().DILATION_RATE],
+                1,
+                max_dilation,
+                operator,
+            )
 
     def _mutate_activation(self):
         self.args[self.get_args_enum().ACTIVATION] = mutate_enum(
@@ -99,6 +174,40 @@ class Layer(NetworkLayer):
             return True
         return False
 
+    def _get_groups(self):
+        return self.args.get(self.get_args_enum().GROUPS) or 1
+
+    def _get_kernel_mag(self):
+        kernel = self.args[self.get_args_enum().KERNEL_SIZE]
+        return kernel[0] * kernel[1]
+
+    def _get_input_channels(self):
+        return shape_tuple(self.inputshape.get())[-1]
+
+    def get_validation_errors(self):
+        errors = super().get_validation_errors()
+        if not self._single_stride() and not self._single_dilation_rate():
+            errors.append("strides and dilation rate are both larger than one")
+        groups = self._get_groups()
+        filters = self.args[self.get_args_enum().FILTERS]
+        if self._get_input_channels() % groups or filters % groups:
+            errors.append(
+                "{} input channels and {} filters are not divisible into {} groups".format(
+                    self._get_input_channels(), filters, groups
+                )
+            )
+        return errors
+
+    def param_count(self):
+        filters = self.args[self.get_args_enum().FILTERS]
+        in_channels = self._get_input_channels() // self._get_groups()
+        return self._get_kernel_mag() * in_channels * filters + filters
+
+    def flops(self):
+        out = self.get_output_shape()
+        in_channels = self._get_input_channels() // self._get_groups()
+        return 2 * out[0] * out[1] * out[2] * self._get_kernel_mag() * in_channels
+
     @staticmethod
     def _same_pad_output_shape(input, stride):
         return ((input - 1) // stride) + 1
@@ -108,7 +217,17 @@ class Layer(NetworkLayer):
         return ((input - kernel) // stride) + 1
 
     @staticmethod
-    def conv2Doutputshape(input_size, stride, kernel_size, filter_count, padding):
+    def _dilated_kernel_size(kernel, dilation):
+        return (kernel - 1) * dilation + 1
+
+    @staticmethod
+    def conv2Doutputshape(
+        input_size, stride, kernel_size, filter_count, padding, dilation_rate=(1, 1)
+    ):
+        kernel_size = (
+            Layer._dilated_kernel_size(kernel_size[0], dilation_rate[0]),
+            Layer._dilated_kernel_size(kernel_size[1], dilation_rate[1]),
+        )
         if padding == la.ArgPadding.SAME:
             X = Layer._same_pad_output_shape(input_size[0], stride[0])
             Y = Layer._same_pad_output_shape(input_size[1], stride[1])
@@ -127,4 +246,5 @@ class Layer(NetworkLayer):
             kernel_size=self.args[self.get_args_enum().KERNEL_SIZE],
             filter_count=self.args[self.get_args_enum().FILTERS],
             padding=self.args[self.get_args_enum().PADDING],
+            dilation_rate=self.args[self.get_args_enum().DILATION_RATE],
         )
@@ -6,6 +6,8 @@ from tensornas.layers.Dense import Layer
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     MAX_UNITS = 256
 
     def _gen_args(self, input_shape, args):
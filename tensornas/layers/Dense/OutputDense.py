@@ -4,6 +4,8 @@ from tensornas.layers.Dense import Args as dense_args
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     def _gen_args(self, input_shape, args):
         class_count = args.get(dense_args.UNITS)
         if not args:
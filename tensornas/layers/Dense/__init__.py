@@ -1,8 +1,7 @@
 from enum import Enum, auto
 
-import tensorflow as tf
-
 from tensornas.core.layer import NetworkLayer
+from tensornas.core.util import dimension_mag, shape_tuple
 
 
 class Args(Enum):
@@ -12,10 +11,33 @@ class Args(Enum):
 
 
 class Layer(NetworkLayer):
+    __slots__ = ()
+
     def get_output_shape(self):
         return (1, self.args.get(self.get_args_enum().UNITS))
 
+    def param_count(self):
+        units = self.args.get(self.get_args_enum().UNITS)
+        return shape_tuple(self.inputshape.get())[-1] * units + units
+
+    def flops(self):
+        """
+        Keras applies a dense layer along the last axis of its input, ie. once per element of the leading axes
+        """
+        units = self.args.get(self.get_args_enum().UNITS)
+        inp = shape_tuple(self.inputshape.get())
+        return 2 * dimension_mag(inp) * units
+
+    def get_validation_errors(self):
+        errors = super().get_validation_errors()
+        inp = shape_tuple(self.inputshape.dimensions)
+        if dimension_mag(inp) != inp[-1]:
+            errors.append("input {} is not flattened".format(inp))
+        return errors
+
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.Dense(
             units=self.args.get(self.get_args_enum().UNITS),
             activation=self.args.get(self.get_args_enum().ACTIVATION).value,
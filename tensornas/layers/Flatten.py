@@ -1,7 +1,5 @@
 from enum import Enum, auto
 
-import tensorflow as tf
-
 from tensornas.core.layer import NetworkLayer
 from tensornas.core.util import dimension_mag
 
@@ -11,6 +9,8 @@ class Args(Enum):
 
 
 class Layer(NetworkLayer):
+    __slots__ = ()
+
     def _gen_args(self, input_shape, args):
         return {}
 
@@ -18,4 +18,6 @@ class Layer(NetworkLayer):
         return (1, dimension_mag(self.inputshape.get()))
 
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.Flatten(input_shape=self.inputshape.get())(input_tensor)
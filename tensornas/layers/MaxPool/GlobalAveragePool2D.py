@@ -1,13 +1,20 @@
-import tensorflow as tf
 from tensornas.layers.MaxPool import Layer
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     def get_output_shape(self):
         inp = self.inputshape.get()
         return inp[-1]
 
+    def flops(self):
+        inp = self.inputshape.get()
+        return inp[0] * inp[1] * inp[2]
+
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.GlobalAveragePooling2D(data_format="channels_last")(
             input_tensor
         )
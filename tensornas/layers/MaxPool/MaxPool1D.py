@@ -1,5 +1,3 @@
-import tensorflow as tf
-
 from tensornas.core.layerargs import *
 from tensornas.layers.MaxPool import (
     Layer,
@@ -10,6 +8,8 @@ from tensornas.core.util import MutationOperators
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     MAX_POOL_SIZE = 5
     MAX_STRIDE_SIZE = 5
 
@@ -46,6 +46,8 @@ class Layer(Layer):
         return (0, 0)
 
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.MaxPool1D(
             input_shape=self.inputshape.get(),
             pool_size=self.args.get(self.get_args_enum().POOL_SIZE),
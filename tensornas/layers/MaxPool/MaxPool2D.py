@@ -1,7 +1,5 @@
 from math import ceil
 
-import tensorflow as tf
-
 from tensornas.core.layerargs import *
 from tensornas.layers.MaxPool import (
     Layer,
@@ -11,21 +9,31 @@ from tensornas.layers.MaxPool import (
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     MAX_POOL_SIZE = 5
     MAX_STRIDE_SIZE = 5
 
     def _gen_args(self, input_shape, args):
-        pool_size = gen_2d_poolsize(random.randint(1, self.MAX_POOL_SIZE))
-        stride_size = gen_2d_strides(random.randint(1, self.MAX_STRIDE_SIZE))
         padding = gen_padding()
+        if args and self.get_args_enum().PADDING in args:
+            padding = args.get(self.get_args_enum().PADDING)
+
+        # Only pool sizes that produce a non-empty output for the input shape and padding are sampled
+        pool_size = gen_2d_poolsize(
+            random.randint(
+                1, max_window_size(input_shape, padding, self.MAX_POOL_SIZE)
+            )
+        )
+        stride_size = gen_2d_strides(random.randint(1, self.MAX_STRIDE_SIZE))
 
         if args:
-            if self.get_args_enum().PADDING in args:
-                padding = args.get(self.get_args_enum().PADDING)
             if self.get_args_enum().STRIDES in args:
                 stride_size = args.get(self.get_args_enum().STRIDES)
             if self.get_args_enum().POOL_SIZE in args:
                 pool_size = args.get(self.get_args_enum().POOL_SIZE)
+        if padding == ArgPadding.VALID and not fits_input(input_shape, pool_size):
+            padding = ArgPadding.SAME
 
         return {
             self.get_args_enum().POOL_SIZE: pool_size,
@@ -34,13 +42,13 @@ class Layer(Layer):
         }
 
     def repair(self):
-        for x, val in enumerate(self.args[self.get_args_enum().STRIDES]):
-            if not val > 0:
-                self.args[self.get_args_enum().STRIDES][x] = 1
-
-        for x, val in enumerate(self.args[self.get_args_enum().POOL_SIZE]):
-            if not val > 0:
-                self.args[self.get_args_enum().POOL_SIZE][x] = 1
+        # Pool sizes that no longer fit within the input use same padding, such that the output is not empty
+        padding = self.args[self.get_args_enum().PADDING]
+        pool_size = self.args[self.get_args_enum().POOL_SIZE]
+        if padding == ArgPadding.VALID and not fits_input(
+            self.inputshape.get(), pool_size
+        ):
+            self.args[self.get_args_enum().PADDING] = ArgPadding.SAME
 
     def get_output_shape(self):
         inp = self.inputshape.get()
@@ -63,7 +71,14 @@ class Layer(Layer):
                 raise Exception("I/O shapes not able to be made compatible")
         return (0, 0, 0)
 
+    def flops(self):
+        pool = self.args[self.get_args_enum().POOL_SIZE]
+        out = self.get_output_shape()
+        return out[0] * out[1] * out[2] * pool[0] * pool[1]
+
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.MaxPool2D(
             input_shape=self.inputshape.get(),
             pool_size=self.args.get(self.get_args_enum().POOL_SIZE),
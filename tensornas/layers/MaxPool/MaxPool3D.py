@@ -1,12 +1,12 @@
 from math import ceil
 
-import tensorflow as tf
-
 from tensornas.core.layerargs import *
 from tensornas.layers.MaxPool import Layer
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     def _gen_args(self, input_shape, args):
         return {
             self.get_args_enum().POOL_SIZE: gen_3d_poolsize(
@@ -23,6 +23,8 @@ class Layer(Layer):
         return self.inputshape.get()
 
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.MaxPool3D(
             input_shape=self.inputshape.get(),
             pool_size=self.args.get(self.get_args_enum().POOL_SIZE),
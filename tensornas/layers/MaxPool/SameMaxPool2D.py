@@ -5,6 +5,8 @@ import tensornas.core.layerargs as la
 
 
 class Layer(Layer):
+    __slots__ = ()
+
     def _gen_args(self, input_shape, args):
         return {
             self.get_args_enum().POOL_SIZE: gen_2d_poolsize(
@@ -10,9 +10,10 @@ def valid_pad_output_shape(input, pool, stride):
 
 
 def same_pad_output_shape(input, pool, stride):
-    return valid_pad_output_shape(input, pool, stride) + (
-        1 if ((input - pool) % stride) else 0
-    )
+    """
+    With same padding the input is padded such that the output size only depends on the stride, as done by keras.
+    """
+    return ((input - 1) // stride) + 1
 
 
 class Args(Enum):
@@ -23,16 +24,25 @@ class Args(Enum):
 
 
 class Layer(NetworkLayer):
+    __slots__ = ()
+
     MAX_POOL_SIZE = 7
     MAX_STRIDE = 7
 
     def _mutate_pool_size(self, operator=MutationOperators.SYNC_STEP):
-        self.args[self.get_args_enum().POOL_SIZE] = mutate_tuple(
-            self.args[self.get_args_enum().POOL_SIZE],
-            1,
+        # The pool size is constrained such that the output is not empty
+        max_pool = la.max_window_size(
+            self.inputshape.get(),
+            self.args[self.get_args_enum().PADDING],
             self.MAX_POOL_SIZE,
-            operator=operator,
         )
+        if max_pool > 1:
+            self.args[self.get_args_enum().POOL_SIZE] = mutate_tuple(
+                self.args[self.get_args_enum().POOL_SIZE],
+                1,
+                max_pool,
+                operator=operator,
+            )
 
     def _mutate_strides(self, operator=MutationOperators.SYNC_STEP):
         self.args[self.get_args_enum().STRIDES] = mutate_tuple(
@@ -43,6 +53,9 @@ class Layer(NetworkLayer):
         )
 
     def _mutate_padding(self):
-        self.args[self.get_args_enum().PADDING] = mutate_enum(
-            self.args[self.get_args_enum().PADDING], la.ArgPadding
-        )
+        padding = mutate_enum(self.args[self.get_args_enum().PADDING], la.ArgPadding)
+        if padding == la.ArgPadding.VALID and not la.fits_input(
+            self.inputshape.get(), self.args[self.get_args_enum().POOL_SIZE]
+        ):
+            return
+        self.args[self.get_args_enum().PADDING] = padding
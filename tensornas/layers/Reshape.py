@@ -1,7 +1,5 @@
 from enum import Enum, auto
 
-import tensorflow as tf
-
 from tensornas.core.layer import NetworkLayer
 from tensornas.core.util import dimension_mag, mutate_dimension
 
@@ -12,6 +10,8 @@ class Args(Enum):
 
 
 class Layer(NetworkLayer):
+    __slots__ = ()
+
     def _gen_args(self, input_shape, target_shape):
         return {self.get_args_enum().TARGET_SHAPE: target_shape}
 
@@ -23,7 +23,20 @@ class Layer(NetworkLayer):
     def get_output_shape(self):
         return self.args[self.get_args_enum().TARGET_SHAPE]
 
+    def get_validation_errors(self):
+        errors = super().get_validation_errors()
+        target_shape = self.args[self.get_args_enum().TARGET_SHAPE]
+        if dimension_mag(target_shape) != dimension_mag(self.inputshape.get()):
+            errors.append(
+                "target shape {} does not match the magnitude of input {}".format(
+                    target_shape, self.inputshape.get()
+                )
+            )
+        return errors
+
     def get_keras_layer(self, input_tensor):
+        import tensorflow as tf
+
         return tf.keras.layers.Reshape(
             self.args.get(self.get_args_enum().TARGET_SHAPE),
             input_shape=self.inputshape.get(),
@@ -1,7 +1,5 @@
 from enum import Enum, auto
 
-import tensorflow as tf
-
 import tensornas.core.layerargs as la
 from tensornas.core.layer import NetworkLayer
 from tensornas.core.util import dimension_mag, mutate_int
@@ -36,6 +34,8 @@ class Args(Enum):
 
 
 class Layer(NetworkLayer):
+    __slots__ = ()
+
     def _gen_args(self, input_shape, args):
         from random import choice
 
@@ -53,6 +53,18 @@ class Layer(NetworkLayer):
     def get_output_shape(self):
         return self.inputshape.get()
 
+    def get_validation_errors(self):
+        errors = super().get_validation_errors()
+        groups = self.args[self.get_args_enum().NUM_GROUPS]
+        channels = self.inputshape.get()[-1]
+        if channels % groups:
+            errors.append(
+                "{} input channels are not divisible into {} groups".format(
+                    channels, groups
+                )
+            )
+        return errors
+
     def get_keras_layer(self, input_tensor):
         return shuffle_channels(
             input_tensor, self.args.get(self.get_args_enum().NUM_GROUPS)
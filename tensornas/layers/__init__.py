@@ -1,31 +1,55 @@
 #!/usr/bin/env python
+import os
 from enum import Enum
+from functools import lru_cache
+from importlib import import_module
 
-from setuptools import find_packages
+from tensornas.core.util import find_module_names
 
-from tensornas.core.util import find_modules
 
+class LazyModule:
+    """
+    Stands in for a layer module, the module, and thus TensorFlow, is only imported once one of its attributes is
+    accessed, eg. `Layers.CONV2D.value.Layer`. This keeps importing tensornas fast as the layer modules only need to
+    be imported once a layer of their type is created.
+    """
 
-def find_layer_modules():
-    import tensornas.layers as Layers
-    import itertools
-    import os
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
 
-    modules = []
-    layer_pkg = Layers.__name__
-    layer_dir = os.path.dirname(Layers.__file__)
-    modules.append(find_modules(layer_pkg, layer_dir))
+    def __getattr__(self, attr):
+        # Special attribute lookups, eg. by the Enum machinery or copy, should not trigger an import
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(import_module(self.name), attr)
 
-    for pkg in find_packages(layer_dir):
-        pkg_path = layer_dir + "/" + pkg.replace(".", "/")
-        modules.append(find_modules(layer_pkg + "." + pkg, pkg_path))
+    def __repr__(self):
+        return "<lazy module '{}'>".format(self.name)
 
-    return list(itertools.chain(*modules))
+
+def find_layer_modules():
+    """
+    Returns the names of all layer modules within the layers sub-package and its sub-packages, without importing them.
+    """
+    return find_module_names(__name__, os.path.dirname(__file__))
 
 
 LayerModules = find_layer_modules()
-LayerNames = [(lambda i: i.__name__.split(".")[-1])(i) for i in LayerModules]
+LayerNames = [(lambda i: i.split(".")[-1])(i) for i in LayerModules]
 Layers = Enum(
-    "Layers", {str.upper(layer): mod for layer, mod in zip(LayerNames, LayerModules)}
+    "Layers",
+    {str.upper(layer): LazyModule(mod) for layer, mod in zip(LayerNames, LayerModules)},
 )
 SupportedLayers = Enum("SupportedLayers", {str.upper(i): i for i in LayerNames})
+
+
+@lru_cache(maxsize=None)
+def get_layer_class(layer_type):
+    """
+    Returns the Layer class of a layer type, importing the layer's module on first use.
+
+    @param layer_type SupportedLayers member of the layer
+    """
+    return Layers[layer_type.name].value.Layer